@@ -1,168 +1,323 @@
+import time
+import_started = time.perf_counter()
+
 import streamlit as st
 import json
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import os
-import spacy
-import subprocess
 import sys
 from pathlib import Path
-from keybert import KeyBERT
-import re
-
-# Optional for DOCX support
-try:
-    import docx2txt
-except ImportError:
-    docx2txt = None
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+# Torch, KeyBERT and Selenium are only imported when first needed, so the
+# upload widget appears without waiting on them.
+from ingest_queue import IngestQueue
+from job_store import JobStore, DEFAULT_DB_PATH, content_hash
+from vector_index import JobVectorIndex, sync_index
+from job_frame import build_job_frame, filter_mask
+from embedding_cache import EmbeddingCache, encode_with_cache
+from encoders import MODEL_NAME, cosine_scores, get_document_encoder, get_sentence_model, load_times, warm_models
+from matching import build_cover_letter, extract_skills_batch
+from resume_analysis import analyse_resume, file_hash
+
+app_import_seconds = time.perf_counter() - import_started
 
 st.set_page_config(page_title="AI Career Compass", layout="wide")
 st.title("\U0001F680 AI Career Compass")
 st.markdown("Matching job listings to your resume using local AI.")
 
-# Load spaCy NLP model (cached at startup)
-@st.cache_resource
-def load_nlp_model():
-    return spacy.load("en_core_web_sm")
-
-nlp = load_nlp_model()
-
-def flatten_keywords(phrases):
-    words = set()
-    for phrase in phrases:
-        for word in phrase.lower().split():
-            words.add(word.strip())
-    return sorted(words)
-
-
-
 
-def is_valid_phrase(kw: str) -> bool:
-    kw = kw.strip().lower()
+# Load the models in the background while the user picks a resume; the loaders
+# below share the same process-wide instances and wait for them if needed.
+@st.cache_resource
+def start_model_warmup():
+    thread = threading.Thread(target=warm_models, args=(MODEL_NAME,), name="model-warmup", daemon=True)
+    thread.start()
+    return {"thread": thread, "app_imports": app_import_seconds}
 
-    # Ignore empty or purely numeric
-    if not kw or kw.isnumeric():
-        return False
+warmup = start_model_warmup()
 
-    # Ignore phrases with only stopwords or filler terms
-    WEAK_WORDS = {"skills", "experience", "expertise", "proficient", "ability", "various", "strong", "knowledge", "understanding", "working", "role", "team"}
-    tokens = kw.split()
-    if all(tok in WEAK_WORDS for tok in tokens):
-        return False
 
-    # Too short (e.g., "bi", "ai", unless useful — tweak min length as needed)
-    if len(kw) < 3:
-        return False
+def render_startup_report():
+    with st.sidebar.expander("\u23F1\ufe0f Startup timings"):
+        st.markdown(f"- App imports: {warmup['app_imports']:.2f}s")
+        for component, seconds in load_times().items():
+            st.markdown(f"- {component}: {seconds:.2f}s")
+        if warmup["thread"].is_alive():
+            st.caption("Models are still loading in the background.")
 
-    # Ignore phrases with weak structure like "adjective noun"
-    # e.g., "proficient sql", "strong cloud"
-    if len(tokens) == 2 and re.match(r"^(proficient|strong|expertise|solid)$", tokens[0]):
-        return False
+@st.cache_resource
+def load_sentence_model():
+    return get_sentence_model(MODEL_NAME)
 
-    # Optional: Keep only noun-based phrases (could plug in spaCy here)
+# Long descriptions are chunked and pooled rather than truncated at the model's sequence limit
+@st.cache_resource
+def load_document_encoder():
+    return get_document_encoder(MODEL_NAME)
 
-    return True
+@st.cache_resource
+def load_embedding_cache():
+    encoder = load_document_encoder()
+    return EmbeddingCache(encoder.name, encoder.get_sentence_embedding_dimension())
 
+# One ingest worker per process: sessions queue searches on it rather than each starting browsers
+@st.cache_resource
+def load_ingest_queue():
+    return IngestQueue()
 
 @st.cache_resource
-def load_keybert_model():
-    return KeyBERT("all-MiniLM-L6-v2")
+def load_vector_index():
+    return JobVectorIndex(load_sentence_model().get_sentence_embedding_dimension())
 
-kw_model = load_keybert_model()
+RESUME_CACHE_SIZE = 32
 
 @st.cache_resource
-def load_sentence_model():
-    return SentenceTransformer("all-MiniLM-L6-v2")
+def load_analysis_executor():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="resume-analysis")
+
+# Keyed on the file's hash and shared by all sessions; least recently used analyses go past RESUME_CACHE_SIZE
+@st.cache_resource(max_entries=RESUME_CACHE_SIZE, show_spinner=False)
+def start_resume_analysis(resume_hash, _name, _data):
+    return load_analysis_executor().submit(analyse_resume, _name, _data, load_document_encoder())
+
+@st.cache_data(max_entries=5000, show_spinner=False)
+def analyse_job_skills(job_hash, _description, _embedding):
+    return extract_skills_batch([_description], doc_embeddings=[_embedding])[0]
+
+
+# Keyed on hashes only, so results survive reruns and are shared between sessions
+@st.cache_data(max_entries=5000, show_spinner=False)
+def analyse_skill_gap(job_hash, resume_hash, _job, _resume_skills):
+    job_skills = analyse_job_skills(job_hash, _job["description"], _job["embedding"])
+    resume_skills = set(_resume_skills)
+    matched_skills = sorted(resume_skills.intersection(job_skills))
+    missing_skills = sorted(job_skills - resume_skills)
+    return {
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "cover_letter": build_cover_letter(_job, _resume_skills, matched_skills, missing_skills),
+    }
+
+
+# A fragment reruns on its own, so opening one job's analysis doesn't rerun the page
+@st.fragment
+def render_job_insights(job, resume_skills, resume_hash):
+    job_key = job.get("link", job.get("title", "job"))
+    if not st.toggle("\U0001F9E0 Skill gap & application toolkit", key=f"insights_{job_key}"):
+        return
+
+    with st.spinner("Analysing job..."):
+        analysis = analyse_skill_gap(job.get("content_hash") or content_hash(job), resume_hash, job, resume_skills)
+    matched_skills = analysis["matched_skills"]
+    missing_skills = analysis["missing_skills"]
+
+    with st.expander("\U0001F9E0 Skill Gap Analysis", expanded=True):
+        if matched_skills:
+            st.markdown("\u2705 **Matched Skills:** " + ", ".join(matched_skills))
+        else:
+            st.markdown("\u274C No matched skills found.")
+        if missing_skills:
+            st.markdown("\u26A0\ufe0f **Missing Skills:** " + ", ".join(missing_skills))
+        else:
+            st.markdown("\U0001F389 You're covered on all listed skills!")
+
+    with st.expander("\U0001F4E8 Application Toolkit"):
+        edited_cover_letter = st.text_area(
+            "Cover letter (editable)",
+            value=analysis["cover_letter"],
+            height=240,
+            key=f"cover_letter_{job_key}"
+        )
+        st.download_button(
+            "Download cover letter (.txt)",
+            data=edited_cover_letter,
+            file_name="cover_letter.txt",
+            mime="text/plain",
+        )
+
+        # The JSON pack is only serialised once the user asks for it
+        if st.button("Prepare application pack (.json)", key=f"pack_{job_key}"):
+            application_pack = {
+                "job": {
+                    "title": job.get("title"),
+                    "company": job.get("company"),
+                    "location": job.get("location"),
+                    "link": job.get("link"),
+                },
+                "resume_keywords": resume_skills,
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+                "cover_letter": edited_cover_letter,
+            }
+            st.download_button(
+                "Download application pack (.json)",
+                data=json.dumps(application_pack, indent=2),
+                file_name="application_pack.json",
+                mime="application/json",
+            )
 
-STOPWORDS = {
-    "various", "several", "role", "team", "position", "skills", "work",
-    "ability", "knowledge", "experience", "others", "requirements"
-}
 
+LIVE_TOP_K = 10
+PAGE_SIZE = 20
+MAX_SALARY_FILTER = 400000
+MAX_AGE_FILTER = 60
+POLL_SECONDS = 0.5
+
+
+def render_live_ranking(placeholder, top_matches):
+    with placeholder.container():
+        st.markdown(f"#### \u23F3 Best {len(top_matches)} match(es) so far")
+        for score, _, job in sorted(top_matches, reverse=True):
+            st.markdown(f"- **{job['title']}** at *{job.get('company', 'Unknown')}* — {score * 100:.1f}%")
+
+
+def render_crawl_metrics(summary):
+    with st.expander(f"\u23F1\ufe0f Crawl timings ({summary['run_seconds']:.1f}s)"):
+        rows = [{"stage": stage, **stats} for stage, stats in summary["stages"].items()]
+        st.dataframe(sorted(rows, key=lambda row: -row["total_s"]), hide_index=True, use_container_width=True)
+        st.caption(" | ".join(f"{event}: {value}" for event, value in summary["counters"].items()))
+
+
+def run_search(params, resume_embedding, resume_hash, ticket=None):
+    """Queue one search on the shared ingest worker and rank its jobs live as they arrive.
+
+    The ticket is kept in session state, so a rerun mid-crawl picks it up
+    again instead of starting over. Returns the jobs with embeddings and the
+    crawl's metrics summary.
+    """
+    model = load_document_encoder()
+    embedding_cache = load_embedding_cache()
+    vector_index = load_vector_index()
+    ingest_queue = load_ingest_queue()
+    jobs = []
+
+    # Two-stage search: rank listings on title + teaser, then only open the best ads
+    screen = None
+    if params.get("enrich_top_k"):
+        snippet_model = load_sentence_model()
+        screen = lambda texts: cosine_scores(resume_embedding, snippet_model.encode(texts))
+
+    if ticket is None:
+        ticket = ingest_queue.submit(
+            params, threads=params["threads"], engine=params["engine"], enrich_top_k=params.get("enrich_top_k"),
+            screen=screen, screen_key=resume_hash,
+        )
+    st.session_state["pending_search"] = {"params": params, "ticket": ticket}
+    if ticket.subscribers > 1:
+        st.caption("Someone else is running the same search; sharing their results.")
+
+    progress_bar = st.progress(0.0, text="Collecting job listings...")
+    live_ranking = st.empty()
+    top_matches = []  # min-heap of (score, arrival, job), so the weakest match is dropped first
+
+    seen = 0
+    while True:
+        finished = ticket.finished
+        new_jobs = ticket.poll(seen)
+        seen += len(new_jobs)
+        # Everything that arrived since the last tick is encoded, scored and indexed as one batch
+        described = [job for job in new_jobs if job.get("description")]
+        if described:
+            embeddings = encode_with_cache(model, [job["description"] for job in described], embedding_cache)
+            scores = cosine_scores(resume_embedding, embeddings)
+            vector_index.add([job["link"] for job in described], embeddings, [job["content_hash"] for job in described])
+            for job, embedding, score in zip(described, embeddings, scores):
+                job["match_score"] = round(float(score), 4)
+                job["embedding"] = embedding
+                jobs.append(job)
+
+                entry = (job["match_score"], len(jobs), job)
+                if len(top_matches) < LIVE_TOP_K:
+                    heapq.heappush(top_matches, entry)
+                else:
+                    heapq.heappushpop(top_matches, entry)
+        if new_jobs:
+            render_live_ranking(live_ranking, top_matches)
+        if finished:
+            break
+
+        done, total = ticket.progress
+        if ticket.status == "queued":
+            progress_bar.progress(0.0, text=f"Waiting for {ingest_queue.position(ticket) + 1} search(es) ahead in the queue...")
+        elif total:
+            progress_bar.progress(done / total, text=f"Processed {done}/{total} jobs")
+        time.sleep(POLL_SECONDS)
+
+    st.session_state.pop("pending_search", None)
+    if ticket.error:
+        if not jobs:
+            st.error(f"\u274C Failed to fetch jobs: {ticket.error}")
+            st.stop()
+        # Keep what was already scored rather than throwing it away with the failed crawl
+        st.warning(f"\u26A0\ufe0f The search stopped early ({ticket.error}); showing the {len(jobs)} job(s) found before it did.")
+
+    progress_bar.empty()
+    live_ranking.empty()
+    vector_index.save()
+
+    if screen:
+        skipped = ticket.metrics["counters"].get("detail.screened_out", 0)
+        st.caption(f"Two-stage search: {skipped} listing(s) ranked below the top {params['enrich_top_k']} on their title and teaser and were not opened.")
+    cache_stats = embedding_cache.stats()
+    st.caption(f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({cache_stats['entries']} stored)")
+    return jobs, ticket.metrics
+
+
+def search_local_corpus(params, resume_embedding):
+    """Rank every stored job against the resume without scraping, via the vector index."""
+    model = load_document_encoder()
+    embedding_cache = load_embedding_cache()
+    vector_index = load_vector_index()
+
+    with JobStore(DEFAULT_DB_PATH) as store:
+        with st.spinner("Indexing stored jobs..."):
+            indexed = sync_index(vector_index, store, lambda texts: encode_with_cache(model, texts, embedding_cache))
+
+        # Region is a pre-filter over the index; location and salary are applied by the sidebar filters
+        nz = params["region"] == "New Zealand"
+        search_started = time.perf_counter()
+        hits = vector_index.search(resume_embedding, k=params["top_k"], allowed=lambda link: (".co.nz" in link) == nz)
+        search_ms = (time.perf_counter() - search_started) * 1000
+        jobs = store.get_jobs([link for link, _ in hits])
+
+    st.caption(f"Searched {len(vector_index)} stored jobs in {search_ms:.1f} ms ({vector_index.backend} index, {indexed} newly indexed).")
+    for job, embedding in zip(jobs, vector_index.get_vectors([job["link"] for job in jobs])):
+        job["embedding"] = embedding
+    return jobs
 
-def extract_skills(text):
-    raw_keywords = kw_model.extract_keywords(
-        text,
-        keyphrase_ngram_range=(1, 2),
-        stop_words="english",
-        top_n=15,
-    )
-    seen = set()
-    cleaned = set()
-
-    for kw, _ in raw_keywords:
-        kw_clean = kw.lower().strip()
-        if kw_clean in STOPWORDS:
-            continue
-        if not any(kw_clean in s or s in kw_clean for s in seen):
-            cleaned.add(kw_clean)
-            seen.add(kw_clean)
-
-    return cleaned
-
-def extract_resume_keywords(text, top_n=20):
-    raw_keywords = kw_model.extract_keywords(
-        text,
-        keyphrase_ngram_range=(1, 2),
-        stop_words="english",
-        top_n=top_n,
-    )
 
-    seen = set()
-    cleaned = []
-
-    for kw, _ in raw_keywords:
-        kw_clean = kw.lower().strip()
-
-        if not is_valid_phrase(kw_clean):
-            continue
-
-        # Deduplicate loosely
-        if not any(kw_clean in s or s in kw_clean for s in seen):
-            cleaned.append(kw_clean)
-            seen.add(kw_clean)
-
-    return cleaned
-
-
-def build_cover_letter(job, resume_keywords, matched_skills, missing_skills):
-    company = job.get("company", "the company")
-    title = job.get("title", "this role")
-    location = job.get("location", "your location")
-    top_keywords = ", ".join(list(resume_keywords)[:6]) if resume_keywords else "relevant experience"
-    matched = ", ".join(matched_skills[:6]) if matched_skills else "key requirements"
-    missing = ", ".join(missing_skills[:4]) if missing_skills else "no major gaps"
-    return (
-        f"Dear Hiring Manager,\n\n"
-        f"I am writing to apply for the {title} position at {company} in {location}. "
-        f"My background includes {top_keywords}, and I have hands-on experience with {matched}. "
-        f"I’m excited by the role and confident I can contribute quickly.\n\n"
-        f"From your job description, I see a focus on {matched}. "
-        f"If selected, I can strengthen areas like {missing} through focused learning and collaboration.\n\n"
-        f"Thank you for your time and consideration. I’d welcome the chance to discuss how I can help.\n\n"
-        f"Sincerely,\n"
-        f"[Your Name]\n"
-    )
-    
 st.sidebar.header("\U0001F4C4 Upload Your Resume")
 uploaded_file = st.sidebar.file_uploader("Upload .txt or .docx file", type=["txt", "docx"])
+render_startup_report()
 
 if uploaded_file is None:
     st.warning("Please upload your resume to get match scores.")
     st.stop()
 
-# Read uploaded file
-if uploaded_file.name.endswith(".txt"):
-    resume_text = uploaded_file.read().decode("utf-8")
-elif uploaded_file.name.endswith(".docx") and docx2txt:
-    resume_text = docx2txt.process(uploaded_file)
-else:
-    st.error("Unsupported file type or missing docx2txt.")
+# Resume analysis is cached on the file's content hash, so reruns and other
+# sessions with the same file reuse it; it runs on a worker thread, and a
+# rerun while it is in progress waits on the same analysis instead of restarting it
+resume_data = uploaded_file.getvalue()
+analysis_future = start_resume_analysis(file_hash(resume_data), uploaded_file.name, resume_data)
+if not analysis_future.done():
+    with st.spinner("Reading your resume and extracting keywords..."):
+        wait([analysis_future])
+try:
+    resume_analysis = analysis_future.result()
+except Exception as e:
+    start_resume_analysis.clear()
+    st.error(str(e))
     st.stop()
 
-
-resume_skills = set(extract_resume_keywords(resume_text))  # still returns phrases
-flat_keywords = flatten_keywords(resume_skills)
+resume_hash = resume_analysis.content_hash
+resume_skills = set(resume_analysis.keyphrases)
+resume_embedding = resume_analysis.embedding
+flat_keywords = resume_analysis.keywords
 suggested_keywords = " ".join(flat_keywords) or "data"
 
 # Region and search settings
@@ -177,127 +332,127 @@ with st.sidebar.form("search_form"):
     min_salary = st.number_input("Min Salary", value=100000, step=10000)
     max_salary = st.number_input("Max Salary", value=200000, step=10000)
     st.caption("Salary filtering is best-effort and depends on Seek’s URL parameters.")
-    max_jobs = st.number_input("Number of Jobs", value=20, step=10)
-    threads = st.number_input("Number of threads", value=1, step=1)
+    max_jobs = st.number_input("Number of Jobs", value=20, step=10, min_value=1, help="Listings to collect from the search results.")
+    enrich_top_k = st.number_input(
+        "Open only the best N ads (0 = all)", value=0, step=10, min_value=0,
+        help="Two-stage search: every listing is first scored on its title and teaser from the results page, "
+             "then only the N best are opened for their full description. Collect 500 listings and open 50 "
+             "to cover a broad search for a tenth of the crawl time.",
+    )
+    threads = st.number_input("Number of threads", value=1, step=1, min_value=1)
+    engine = st.selectbox("Detail page fetcher", options=["selenium", "http"], help="http fetches ad pages over pooled connections and only opens a browser for pages that need JavaScript.")
     submitted = st.form_submit_button("🔍 Search Seek Now")
-    
-jobs = []
-
-if submitted:
-    st.info("\U0001F50D Fetching jobs from Seek... this may take a minute.")
-
-    scripts_dir = Path(__file__).resolve().parent.parent / "scripts"
-    ingest_script = scripts_dir / "ingest_seek_selenium.py"
-    result = subprocess.run([
-        sys.executable, str(ingest_script),
-        "--keywords", keywords,
-        "--location", location,
-        "--min_salary", str(min_salary),
-        "--max_salary", str(max_salary),
-        "--region", region,
-        "--max_jobs", str(max_jobs),
-        "--threads", str(threads)
-    ], capture_output=True, text=True)
-
-    if result.returncode != 0:
-        st.error("\u274C Failed to fetch jobs:\n" + result.stderr)
-        st.stop()
-    else:
-        st.success("\u2705 Successfully scraped and enriched jobs.")
-        data_path = Path(__file__).resolve().parent.parent / "data" / "seek_jobs_enriched.json"
-        with open(data_path, "r", encoding="utf-8") as f:
-            jobs = json.load(f)
-
-    # Generate embeddings
-    if not jobs:
-        st.warning("No jobs found for the current search filters.")
-        st.stop()
 
-    model = load_sentence_model()
-    resume_embedding = model.encode(resume_text)
-    job_texts = [job.get("description", "") for job in jobs]
-    if not any(job_texts):
-        st.warning("Fetched jobs are missing descriptions. Try a different search.")
+with st.sidebar.form("corpus_form"):
+    st.subheader("\U0001F4DA Local Corpus")
+    st.caption("Match against every job stored so far, without scraping.")
+    corpus_top_k = st.number_input("Top matches", value=100, step=50, min_value=1)
+    corpus_submitted = st.form_submit_button("\U0001F4DA Search local corpus")
+
+search_params = {
+    "keywords": keywords,
+    "location": location,
+    "min_salary": min_salary,
+    "max_salary": max_salary,
+    "region": region,
+    "max_jobs": int(max_jobs),
+    "threads": int(threads),
+    "engine": engine,
+    "enrich_top_k": int(enrich_top_k) or None,
+}
+search_key = json.dumps(search_params, sort_keys=True)
+
+# Results survive reruns, so sidebar filters apply to them without crawling again
+stored = st.session_state.get("search_results")
+refresh = stored is not None and st.sidebar.button("\U0001F504 Refresh results", help="Run the last search again for new results.")
+
+# A search still running when the page last reran is picked up again from its ticket
+pending = st.session_state.get("pending_search")
+resume_pending = pending is not None and not (submitted or corpus_submitted or refresh)
+
+if submitted and stored is not None and stored["key"] == search_key:
+    st.caption("Same search as last time, showing stored results. Use \U0001F504 Refresh results to fetch new ones.")
+elif submitted or corpus_submitted or refresh or resume_pending:
+    if corpus_submitted or (refresh and stored["mode"] == "corpus"):
+        mode = "corpus"
+        params = {"region": region, "top_k": int(corpus_top_k)} if corpus_submitted else stored["params"]
+        fetched = search_local_corpus(params, resume_embedding)
+        crawl_metrics = None
+    else:
+        mode = "live"
+        params = pending["params"] if resume_pending else search_params if submitted else stored["params"]
+        st.info("\U0001F50D Fetching jobs from Seek... matches appear below as each job is enriched.")
+        fetched, crawl_metrics = run_search(params, resume_embedding, resume_hash, pending["ticket"] if resume_pending else None)
+    if not fetched:
+        st.warning("No jobs with descriptions found for the current search filters.")
         st.stop()
-    job_embeddings = model.encode(job_texts)
-    scores = cosine_similarity([resume_embedding], job_embeddings)[0]
-
-    for job, score in zip(jobs, scores):
-        job["match_score"] = round(float(score), 4)
-
-    jobs = sorted(jobs, key=lambda x: x["match_score"], reverse=True)
-
-    st.sidebar.header("\U0001F50D Filter Jobs")
-    min_score = st.sidebar.slider("Minimum Match %", 0, 100, 50)
-    keyword = st.sidebar.text_input("\U0001F524 Keyword in Title or Description")
-    location_filter = st.sidebar.text_input("\U0001F4CD Location Filter")
-
-    filtered = []
-    for job in jobs:
-        if job["match_score"] * 100 < min_score:
-            continue
-        if keyword and keyword.lower() not in (job["title"] + job["description"]).lower():
-            continue
-        if location_filter and location_filter.lower() not in job.get("location", "").lower():
-            continue
-        filtered.append(job)
-
-    st.markdown(f"### \U0001F3AF Showing {len(filtered)} job(s) above {min_score}% match")
-
-    for job in filtered:
-        st.markdown(f"**{job['title']}** at *{job.get('company', 'Unknown')}*")
-        st.markdown(f"\U0001F4CD {job.get('location', 'N/A')} | \U0001F517 [View on Seek]({job['link']}) | Match: {round(float(job['match_score']*100), 2)}% | Age: {job.get('date_posted', 'Unknown')}")
-        st.progress(job["match_score"])
-
-        with st.expander("\U0001F4C4 Description"):
-            st.write(job["description"])
-
-        job_skills = extract_skills(job["description"])
-        matched_skills = sorted(resume_skills.intersection(job_skills))
-        missing_skills = sorted(job_skills - resume_skills)
-
-        with st.expander("\U0001F9E0 Skill Gap Analysis"):
-            if matched_skills:
-                st.markdown("\u2705 **Matched Skills:** " + ", ".join(matched_skills))
-            else:
-                st.markdown("\u274C No matched skills found.")
-            if missing_skills:
-                st.markdown("\u26A0\ufe0f **Missing Skills:** " + ", ".join(missing_skills))
-            else:
-                st.markdown("\U0001F389 You're covered on all listed skills!")
-
-        with st.expander("\U0001F4E8 Application Toolkit"):
-            cover_letter = build_cover_letter(job, resume_skills, matched_skills, missing_skills)
-            edited_cover_letter = st.text_area(
-                "Cover letter (editable)",
-                value=cover_letter,
-                height=240,
-                key=f"cover_letter_{job.get('link', job.get('title', 'job'))}"
-            )
-            st.download_button(
-                "Download cover letter (.txt)",
-                data=edited_cover_letter,
-                file_name="cover_letter.txt",
-                mime="text/plain",
-            )
 
-            application_pack = {
-                "job": {
-                    "title": job.get("title"),
-                    "company": job.get("company"),
-                    "location": job.get("location"),
-                    "link": job.get("link"),
-                },
-                "resume_keywords": sorted(resume_skills),
-                "matched_skills": matched_skills,
-                "missing_skills": missing_skills,
-                "cover_letter": edited_cover_letter,
-            }
-            st.download_button(
-                "Download application pack (.json)",
-                data=json.dumps(application_pack, indent=2),
-                file_name="application_pack.json",
-                mime="application/json",
-            )
+    st.success(f"\u2705 Scored {len(fetched)} jobs.")
+    stored = {
+        "mode": mode,
+        "key": json.dumps(params, sort_keys=True),
+        "params": params,
+        "jobs": fetched,
+        "embeddings": np.vstack([job["embedding"] for job in fetched]),
+        "frame": build_job_frame(fetched),
+        "crawl_metrics": crawl_metrics,
+    }
+    st.session_state["search_results"] = stored
+
+if stored is None:
+    st.stop()
 
-        st.markdown("---")
+if stored["crawl_metrics"]:
+    render_crawl_metrics(stored["crawl_metrics"])
+
+# Rescoring stored embeddings is cheap and keeps scores in step with the current resume
+frame = stored["frame"]
+scores = cosine_scores(resume_embedding, stored["embeddings"])
+frame["match_score"] = scores
+
+st.sidebar.header("\U0001F50D Filter Jobs")
+min_score = st.sidebar.slider("Minimum Match %", 0, 100, 50)
+keyword = st.sidebar.text_input("\U0001F524 Keyword in Title or Description")
+location_filter = st.sidebar.text_input("\U0001F4CD Location Filter")
+salary_range = st.sidebar.slider("\U0001F4B0 Salary range (annual)", 0, MAX_SALARY_FILTER, (0, MAX_SALARY_FILTER), step=10000)
+max_age_days = st.sidebar.slider("\U0001F4C5 Posted within (days)", 1, MAX_AGE_FILTER, MAX_AGE_FILTER)
+include_unknown = st.sidebar.checkbox("Include jobs without salary or posting date", value=True)
+
+mask = filter_mask(
+    frame,
+    min_score=min_score / 100,
+    keyword=keyword,
+    location=location_filter,
+    salary_range=None if salary_range == (0, MAX_SALARY_FILTER) else salary_range,
+    max_age_days=None if max_age_days == MAX_AGE_FILTER else max_age_days,
+    include_unknown=include_unknown,
+)
+rows = np.flatnonzero(mask)
+rows = rows[np.argsort(-scores[rows], kind="stable")]
+
+# Only the visible page of cards is built and rendered; "Load more" grows it by PAGE_SIZE
+view_key = json.dumps([stored["key"], min_score, keyword, location_filter, salary_range, max_age_days, include_unknown])
+if st.session_state.get("results_view") != view_key:
+    st.session_state["results_view"] = view_key
+    st.session_state["results_shown"] = PAGE_SIZE
+shown = min(st.session_state["results_shown"], len(rows))
+
+st.markdown(f"### \U0001F3AF Showing {shown} of {len(rows)} job(s) above {min_score}% match")
+
+for i in rows[:shown]:
+    job = {**stored["jobs"][i], "match_score": round(float(scores[i]), 4)}
+    st.markdown(f"**{job['title']}** at *{job.get('company', 'Unknown')}*")
+    st.markdown(f"\U0001F4CD {job.get('location', 'N/A')} | \U0001F517 [View on Seek]({job['link']}) | Match: {round(float(job['match_score']*100), 2)}% | Age: {job.get('date_posted', 'Unknown')}")
+    st.progress(job["match_score"])
+
+    with st.expander("\U0001F4C4 Description"):
+        st.write(job["description"])
+
+    render_job_insights(job, sorted(resume_skills), resume_hash)
+
+    st.markdown("---")
+
+if shown < len(rows):
+    if st.button(f"Load more ({len(rows) - shown} remaining)"):
+        st.session_state["results_shown"] += PAGE_SIZE
+        st.rerun()
@@ -0,0 +1,89 @@
+# scripts/bench_encoding.py
+#
+# Compares plain model.encode (truncating, char-length sorted batches of 32)
+# with the chunked, length-bucketed ChunkedEncoder on stored job descriptions.
+
+import argparse
+import json
+import random
+import time
+
+from encoders import MODEL_NAME, ChunkedEncoder, get_sentence_model, padding_waste
+from job_store import JobStore, DEFAULT_DB_PATH
+
+
+def synthetic_descriptions(n, seed=0):
+    rng = random.Random(seed)
+    vocab = ("python sql data pipeline stakeholder cloud azure aws modelling analytics reporting "
+             "machine learning engineer team delivery governance dashboards spark etl").split()
+    # Real ads range from a couple of lines to several pages
+    return [" ".join(rng.choice(vocab) for _ in range(rng.choice([40, 120, 300, 600, 1200]))) for _ in range(n)]
+
+
+def baseline_plan(model, texts, batch_size=32):
+    """Token lengths and batches as SentenceTransformer.encode forms them: sorted by characters, truncated."""
+    max_len = model.get_max_seq_length()
+    token_ids = model.tokenizer(texts, add_special_tokens=False)["input_ids"]
+    lengths = [min(len(ids) + 2, max_len) for ids in token_ids]
+    order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+    batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+    truncated = sum(len(ids) + 2 > max_len for ids in token_ids)
+    return lengths, batches, truncated
+
+
+def run(texts, pooling="mean", token_budget=8192):
+    model = get_sentence_model(MODEL_NAME)
+    encoder = ChunkedEncoder(model, pooling=pooling, token_budget=token_budget)
+    model.encode(texts[:8])  # warm-up
+
+    lengths, batches, truncated = baseline_plan(model, texts)
+    started = time.perf_counter()
+    model.encode(texts, batch_size=32)
+    baseline_seconds = time.perf_counter() - started
+
+    _, _, chunk_lengths, chunk_batches = encoder.plan(texts)
+    started = time.perf_counter()
+    encoder.encode(texts)
+    chunked_seconds = time.perf_counter() - started
+
+    return {
+        "docs": len(texts),
+        "baseline": {
+            "docs_per_sec": round(len(texts) / baseline_seconds, 2),
+            "padding_waste": round(padding_waste(lengths, batches), 4),
+            "truncated_docs": truncated,
+        },
+        "chunked": {
+            "docs_per_sec": round(len(texts) / chunked_seconds, 2),
+            "padding_waste": round(padding_waste(chunk_lengths, chunk_batches), 4),
+            "chunks": len(chunk_lengths),
+            "batches": len(chunk_batches),
+            "pooling": pooling,
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB_PATH))
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark N synthetic descriptions instead of stored jobs")
+    parser.add_argument("--pooling", type=str, default="mean", choices=["mean", "max"])
+    parser.add_argument("--token_budget", type=int, default=8192)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        texts = synthetic_descriptions(args.synthetic)
+    else:
+        with JobStore(args.db) as store:
+            texts = [job["description"] for job in store.all_jobs() if job.get("description")]
+        if not texts:
+            print("No stored job descriptions found, falling back to 500 synthetic ones.")
+            texts = synthetic_descriptions(500)
+
+    report = run(texts, args.pooling, args.token_budget)
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
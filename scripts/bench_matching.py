@@ -0,0 +1,186 @@
+# scripts/bench_matching.py
+#
+# Times each stage of the matching pipeline on synthetic corpora of 100, 1k
+# and 10k jobs. Save a run as the baseline with --save_baseline, then later
+# runs with --baseline flag stages that got slower and exit non-zero.
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from bench_encoding import synthetic_descriptions
+from encoders import MODEL_NAME, cosine_scores, get_document_encoder
+from job_frame import build_job_frame, filter_mask
+from matching import build_cover_letter, extract_resume_keywords, extract_skills, flatten_keywords
+
+
+SIZES = (100, 1000, 10000)
+DEFAULT_BASELINE = Path(__file__).resolve().parent.parent / "data" / "bench" / "matching_baseline.json"
+EMBEDDING_DIM = 384
+
+# A stage counts as regressed when it is this much slower than the baseline...
+REGRESSION_THRESHOLD = 0.25
+# ...and by more than this many milliseconds, so sub-millisecond noise is ignored
+NOISE_FLOOR_MS = 1.0
+
+TITLES = ["Data Engineer", "Senior Data Analyst", "ML Engineer", "Analytics Lead", "BI Developer", "Cloud Data Architect"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay"]
+LOCATIONS = ["Melbourne VIC", "Sydney NSW", "Brisbane QLD", "Auckland", "Remote"]
+SALARIES = ["$120,000 - $140,000 per year", "$90k - $110k + super", "$95 - $110 per hour", "$700 per day", ""]
+AGES = ["Posted 2h ago", "Posted 3d ago", "Posted 12d ago", "Posted 1mo ago", ""]
+
+
+def synthetic_jobs(n, seed=0):
+    rng = random.Random(seed)
+    descriptions = synthetic_descriptions(n, seed)
+    return [
+        {
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "salary": rng.choice(SALARIES),
+            "date_posted": rng.choice(AGES),
+            "link": f"https://www.seek.com.au/job/{seed}{i:06d}",
+            "description": description,
+        }
+        for i, description in enumerate(descriptions)
+    ]
+
+
+def synthetic_resume(seed=0):
+    return synthetic_descriptions(1, seed + 1000)[0]
+
+
+def synthetic_phrases(description, rng, n=15):
+    words = description.split()
+    return {" ".join(words[i:i + 2]) for i in (rng.randrange(len(words) - 1) for _ in range(n))}
+
+
+def time_stage(fn, repeat=3):
+    """Best and mean wall time of fn over repeat runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"best_ms": round(min(timings), 3), "mean_ms": round(sum(timings) / len(timings), 3)}
+
+
+def bench_corpus(n, repeat=3, seed=0):
+    """Stages whose cost grows with the corpus; none of them need the models."""
+    rng = random.Random(seed)
+    jobs = synthetic_jobs(n, seed)
+    resume_skills = sorted(synthetic_phrases(synthetic_resume(seed), rng, 20))
+    job_skills = [synthetic_phrases(job["description"], rng) for job in jobs]
+
+    # Ranking cost doesn't depend on what the vectors encode, so random unit vectors stand in
+    vectors = np.random.default_rng(seed).normal(size=(n, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    resume_vector = vectors[0] + 0.1
+
+    frame = build_job_frame(jobs)
+    frame["match_score"] = cosine_scores(resume_vector, vectors)
+
+    def rank():
+        scores = cosine_scores(resume_vector, vectors)
+        return np.argsort(-scores, kind="stable")[:50]
+
+    def cover_letters():
+        resume = set(resume_skills)
+        for job, skills in zip(jobs, job_skills):
+            build_cover_letter(job, resume_skills, sorted(resume & skills), sorted(skills - resume))
+
+    return {
+        "flatten_keywords": time_stage(lambda: [flatten_keywords(skills) for skills in job_skills], repeat),
+        "cosine_ranking": time_stage(rank, repeat),
+        "build_job_frame": time_stage(lambda: build_job_frame(jobs), repeat),
+        "sidebar_filter": time_stage(lambda: filter_mask(
+            frame, min_score=0.0, keyword="python", location="melbourne",
+            salary_range=(100000, 200000), max_age_days=14, include_unknown=True,
+        ), repeat),
+        "build_cover_letter": time_stage(cover_letters, repeat),
+    }
+
+
+def bench_models(sample=100, repeat=1, seed=0):
+    """Stages that run the encoder or KeyBERT, timed on a fixed sample of jobs."""
+    descriptions = [job["description"] for job in synthetic_jobs(sample, seed)]
+    resume = synthetic_resume(seed)
+    encoder = get_document_encoder(MODEL_NAME)
+    encoder.encode(descriptions[:4])  # warm-up
+
+    report = {
+        "docs": sample,
+        "extract_resume_keywords": time_stage(lambda: extract_resume_keywords(resume), repeat),
+        "extract_skills": time_stage(lambda: [extract_skills(text) for text in descriptions], repeat),
+        "embedding": time_stage(lambda: encoder.encode(descriptions), repeat),
+    }
+    report["embedding"]["docs_per_sec"] = round(sample / (report["embedding"]["best_ms"] / 1000), 2)
+    return report
+
+
+def run(sizes=SIZES, repeat=3, with_models=True, model_sample=100):
+    report = {"sizes": {str(n): bench_corpus(n, repeat) for n in sizes}}
+    if with_models:
+        report["models"] = bench_models(model_sample)
+    return report
+
+
+def _stage_timings(report):
+    for n, stages in report.get("sizes", {}).items():
+        for stage, timing in stages.items():
+            yield f"{n} jobs / {stage}", timing["best_ms"]
+    for stage, timing in report.get("models", {}).items():
+        if isinstance(timing, dict):
+            yield f"models / {stage}", timing["best_ms"]
+
+
+def find_regressions(report, baseline, threshold=REGRESSION_THRESHOLD, noise_floor_ms=NOISE_FLOOR_MS):
+    """Return a line per stage that is slower than the baseline beyond threshold and noise floor."""
+    previous = dict(_stage_timings(baseline))
+    regressions = []
+    for stage, best_ms in _stage_timings(report):
+        before = previous.get(stage)
+        if before is None:
+            continue
+        if best_ms > before * (1 + threshold) and best_ms - before > noise_floor_ms:
+            regressions.append(f"{stage}: {before:.2f} ms -> {best_ms:.2f} ms ({best_ms / before - 1:+.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no_models", action="store_true", help="Skip the stages that need the encoder and KeyBERT")
+    parser.add_argument("--model_sample", type=int, default=100)
+    parser.add_argument("--output", type=str, default=None)
+    parser.add_argument("--baseline", type=str, default=None, help="Compare against this earlier run")
+    parser.add_argument("--save_baseline", action="store_true", help=f"Also write the run to {DEFAULT_BASELINE}")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, not args.no_models, args.model_sample)
+    print(json.dumps(report, indent=2))
+
+    outputs = [Path(args.output)] if args.output else []
+    if args.save_baseline:
+        outputs.append(DEFAULT_BASELINE)
+    for path in outputs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = find_regressions(report, baseline, args.threshold)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline.")
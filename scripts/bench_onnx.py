@@ -0,0 +1,112 @@
+# scripts/bench_onnx.py
+#
+# PyTorch vs int8 ONNX sentence encoder: load time, single-query latency,
+# batch throughput, peak memory and ranking agreement. Each backend runs in
+# its own process so memory figures don't mix.
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy as np
+
+from bench_encoding import synthetic_descriptions
+from encoders import MODEL_NAME, get_sentence_model
+from job_store import JobStore, DEFAULT_DB_PATH
+from onnx_encoder import EMBEDDING_TOLERANCE
+
+
+def measure(backend, texts, queries, model_name=MODEL_NAME):
+    started = time.perf_counter()
+    model = get_sentence_model(model_name, backend)
+    load_seconds = time.perf_counter() - started
+    model.encode(texts[:8])  # warm-up
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        model.encode(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    text_embeddings = model.encode(texts, batch_size=32)
+    throughput = len(texts) / (time.perf_counter() - started)
+
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 3),
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+        "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2),
+        "docs_per_sec": round(throughput, 2),
+        # ru_maxrss is in KB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "text_embeddings": np.asarray(text_embeddings, dtype=np.float32),
+        "query_embeddings": np.asarray(model.encode(queries), dtype=np.float32),
+    }
+
+
+def _normalize(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def ranking_agreement(reference, candidate, k=10):
+    ref_texts, ref_queries = _normalize(reference["text_embeddings"]), _normalize(reference["query_embeddings"])
+    cand_texts, cand_queries = _normalize(candidate["text_embeddings"]), _normalize(candidate["query_embeddings"])
+
+    cosine_distance = 1 - float(np.mean(np.sum(ref_texts * cand_texts, axis=1)))
+    ref_scores = ref_queries @ ref_texts.T
+    cand_scores = cand_queries @ cand_texts.T
+    overlaps = []
+    for ref_row, cand_row in zip(ref_scores, cand_scores):
+        ref_top = set(np.argsort(-ref_row)[:k])
+        cand_top = set(np.argsort(-cand_row)[:k])
+        overlaps.append(len(ref_top & cand_top) / k)
+
+    return {
+        "mean_cosine_distance": round(cosine_distance, 5),
+        "max_score_delta": round(float(np.max(np.abs(ref_scores - cand_scores))), 5),
+        f"top{k}_overlap": round(float(np.mean(overlaps)), 4),
+        "tolerance": EMBEDDING_TOLERANCE,
+        "within_tolerance": cosine_distance <= EMBEDDING_TOLERANCE,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB_PATH))
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    with JobStore(args.db) as store:
+        texts = [job["description"] for job in store.all_jobs() if job.get("description")][:args.docs]
+    if len(texts) < args.docs:
+        texts += synthetic_descriptions(args.docs - len(texts))
+    queries = synthetic_descriptions(args.queries, seed=1)
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in ("torch", "onnx"):
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(measure, (backend, texts, queries))
+
+    report = {
+        "docs": len(texts),
+        "queries": len(queries),
+        "backends": {
+            backend: {key: value for key, value in result.items() if not key.endswith("embeddings")}
+            for backend, result in results.items()
+        },
+        "agreement": ranking_agreement(results["torch"], results["onnx"]),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    sys.exit(0 if report["agreement"]["within_tolerance"] else 1)
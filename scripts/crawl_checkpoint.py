@@ -0,0 +1,190 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from job_store import DEFAULT_DB_PATH, canonical_link
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    run_id TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS crawl_queries (
+    run_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    listing_done INTEGER NOT NULL DEFAULT 0,
+    next_page INTEGER NOT NULL DEFAULT 1,
+    collected INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS crawl_frontier (
+    run_id TEXT NOT NULL,
+    link TEXT NOT NULL,
+    listing TEXT NOT NULL,
+    queries TEXT NOT NULL,
+    state TEXT NOT NULL,
+    reason TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, link)
+);
+"""
+# pending: waiting for enrichment; held: waiting for two-stage screening;
+# done: enriched or still fresh in the job store; failed: see reason; skipped: screened out
+STATES = ("pending", "held", "done", "failed", "skipped")
+
+
+def new_run_id():
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+class CrawlCheckpoint:
+    """Persistent record of one crawl run in the SQLite job database, from which it can be resumed."""
+
+    def __init__(self, run_id=None, path=DEFAULT_DB_PATH):
+        self.run_id = run_id or new_run_id()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # Databases from before listing positions were recorded
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(crawl_queries)")}
+        for column, default in (("next_page", 1), ("collected", 0)):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE crawl_queries ADD COLUMN {column} INTEGER NOT NULL DEFAULT {default}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def start(self, queries, meta=None):
+        """Register a new run with its query specs; ``meta`` holds anything else needed to resume it."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO crawl_runs (run_id, meta, status, started_at, updated_at) VALUES (?, ?, 'running', ?, ?)",
+                (self.run_id, json.dumps(meta or {}), now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO crawl_queries (run_id, name, spec) VALUES (?, ?, ?)",
+                [(self.run_id, query["name"], json.dumps(query)) for query in queries],
+            )
+
+    def exists(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM crawl_runs WHERE run_id = ?", (self.run_id,)).fetchone() is not None
+
+    def meta(self):
+        with self._lock:
+            row = self._conn.execute("SELECT meta FROM crawl_runs WHERE run_id = ?", (self.run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No crawl run {self.run_id!r} in {self.path}")
+        return json.loads(row["meta"])
+
+    def queries(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT spec FROM crawl_queries WHERE run_id = ? ORDER BY rowid", (self.run_id,)).fetchall()
+        return [json.loads(row["spec"]) for row in rows]
+
+    def listed_queries(self):
+        """Names of the queries whose listing crawl has finished."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM crawl_queries WHERE run_id = ? AND listing_done = 1", (self.run_id,)).fetchall()
+        return {row["name"] for row in rows}
+
+    def listing_positions(self):
+        """{name: (next page, jobs listed so far)} for the queries whose listing crawl hasn't finished."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, next_page, collected FROM crawl_queries WHERE run_id = ? AND listing_done = 0", (self.run_id,)
+            ).fetchall()
+        return {row["name"]: (row["next_page"], row["collected"]) for row in rows}
+
+    def listing_progress(self, name, next_page, collected):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE crawl_queries SET next_page = ?, collected = ? WHERE run_id = ? AND name = ?",
+                (next_page, collected, self.run_id, name),
+            )
+
+    def listing_finished(self, name):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE crawl_queries SET listing_done = 1 WHERE run_id = ? AND name = ?", (self.run_id, name))
+
+    def add(self, jobs, name, state="pending"):
+        """Add newly listed ads to the frontier; ads already in it are left alone."""
+        now = time.time()
+        rows = [(self.run_id, canonical_link(job["link"]), json.dumps(job), json.dumps([name]), state, now) for job in jobs]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_frontier (run_id, link, listing, queries, state, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def add_query(self, link, names):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE crawl_frontier SET queries = ? WHERE run_id = ? AND link = ?",
+                (json.dumps(names), self.run_id, canonical_link(link)),
+            )
+
+    def mark(self, links, state, reason=None):
+        if state not in STATES:
+            raise ValueError(f"Unknown frontier state {state!r}")
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                UPDATE crawl_frontier SET state = ?, reason = ?, updated_at = ?,
+                    attempts = attempts + (CASE WHEN ? IN ('done', 'failed') THEN 1 ELSE 0 END)
+                WHERE run_id = ? AND link = ?
+                """,
+                [(state, reason, now, state, self.run_id, canonical_link(link)) for link in links],
+            )
+
+    def frontier(self):
+        """Map of canonical link to (listing job, query names, state) for every ad in the run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT link, listing, queries, state FROM crawl_frontier WHERE run_id = ? ORDER BY rowid", (self.run_id,)
+            ).fetchall()
+        return {row["link"]: (json.loads(row["listing"]), json.loads(row["queries"]), row["state"]) for row in rows}
+
+    def failures(self):
+        """[(link, reason, attempts)] for ads that failed on their latest attempt."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT link, reason, attempts FROM crawl_frontier WHERE run_id = ? AND state = 'failed' ORDER BY rowid",
+                (self.run_id,),
+            ).fetchall()
+        return [(row["link"], row["reason"], row["attempts"]) for row in rows]
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) AS n FROM crawl_frontier WHERE run_id = ? GROUP BY state", (self.run_id,)
+            ).fetchall()
+        return {row["state"]: row["n"] for row in rows}
+
+    def finish(self, status):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE crawl_runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), self.run_id)
+            )
@@ -0,0 +1,112 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+
+DEFAULT_METRICS_DIR = Path(__file__).resolve().parent.parent / "data" / "metrics"
+QUANTILES = (0.5, 0.95)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class CrawlMetrics:
+    """Timing spans and event counters for one crawl, safe to share between worker threads.
+
+    Stages are dotted names such as ``detail.navigate``; counters are events
+    such as ``detail.timeout``.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._durations = defaultdict(list)
+        self._counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._durations[stage].append(seconds)
+
+    def count(self, event, n=1):
+        with self._lock:
+            self._counters[event] += n
+
+    def summary(self):
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self._durations.items()}
+            counters = dict(self._counters)
+        stages = {}
+        for stage, values in sorted(durations.items()):
+            stages[stage] = {
+                "count": len(values),
+                "total_s": round(sum(values), 4),
+                "p50_s": round(percentile(values, 0.5), 4),
+                "p95_s": round(percentile(values, 0.95), 4),
+                "max_s": round(max(values), 4),
+            }
+        return {
+            "started_at": self.started,
+            "run_seconds": round(time.time() - self.started, 3),
+            "stages": stages,
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def to_prometheus(self, summary=None):
+        summary = summary or self.summary()
+        lines = [
+            "# HELP seek_ingest_stage_seconds Duration of Seek ingester stages.",
+            "# TYPE seek_ingest_stage_seconds summary",
+        ]
+        for stage, stats in summary["stages"].items():
+            for q in QUANTILES:
+                key = "p50_s" if q == 0.5 else "p95_s"
+                lines.append(f'seek_ingest_stage_seconds{{stage="{stage}",quantile="{q}"}} {stats[key]}')
+            lines.append(f'seek_ingest_stage_seconds_sum{{stage="{stage}"}} {stats["total_s"]}')
+            lines.append(f'seek_ingest_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += [
+            "# HELP seek_ingest_events_total Seek ingester outcomes.",
+            "# TYPE seek_ingest_events_total counter",
+        ]
+        for event, value in summary["counters"].items():
+            lines.append(f'seek_ingest_events_total{{event="{event}"}} {value}')
+        lines += [
+            "# HELP seek_ingest_run_seconds Wall time of the last crawl.",
+            "# TYPE seek_ingest_run_seconds gauge",
+            f"seek_ingest_run_seconds {summary['run_seconds']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, metrics_dir=DEFAULT_METRICS_DIR):
+        """Write crawl_metrics.json and crawl_metrics.prom (node-exporter textfile format)."""
+        metrics_dir = Path(metrics_dir)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+        (metrics_dir / "crawl_metrics.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        (metrics_dir / "crawl_metrics.prom").write_text(self.to_prometheus(summary), encoding="utf-8")
+        return summary
+
+
+def format_summary(summary):
+    """Plain-text table of the slowest stages first, for CLI output."""
+    rows = sorted(summary["stages"].items(), key=lambda item: -item[1]["total_s"])
+    lines = [f"{'stage':<24}{'count':>7}{'total s':>10}{'p50 s':>9}{'p95 s':>9}"]
+    for stage, stats in rows:
+        lines.append(f"{stage:<24}{stats['count']:>7}{stats['total_s']:>10.2f}{stats['p50_s']:>9.2f}{stats['p95_s']:>9.2f}")
+    counters = ", ".join(f"{event}={value}" for event, value in summary["counters"].items())
+    lines.append(f"events: {counters or 'none'} | run: {summary['run_seconds']:.1f}s")
+    return "\n".join(lines)
@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+# Scraping reads the DOM and the embedded page state, never the pixels
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css",
+]
+
+
+def build_chrome_options(block_resources=True):
+    chrome_options = Options()
+    if block_resources:
+        # Return from driver.get at DOMContentLoaded; callers wait for what they need
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920x1080")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+    return chrome_options
+
+
+class DriverPool:
+    """Bounded pool of long-lived Chrome drivers shared by worker threads.
+
+    The chromedriver binary is installed once per pool. Drivers are created
+    lazily up to ``size``, health-checked when taken from the pool, and
+    recycled after ``max_pages`` leases or as soon as one of them crashes.
+    Driver start-up time is recorded as ``driver.startup`` when a
+    CrawlMetrics is passed. With ``block_resources`` images, fonts and
+    stylesheets are never downloaded.
+    """
+
+    def __init__(self, size=5, options=None, max_pages=25, metrics=None, block_resources=True):
+        self.size = max(1, size)
+        self.options = options or build_chrome_options(block_resources)
+        self.max_pages = max_pages
+        self.block_resources = block_resources
+        self.metrics = metrics
+        self._service_path = None
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _install(self):
+        with self._lock:
+            if self._service_path is None:
+                self._service_path = ChromeDriverManager().install()
+            return self._service_path
+
+    def _create(self):
+        started = time.perf_counter()
+        driver = webdriver.Chrome(service=Service(self._install()), options=self.options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.block_resources:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCES})
+        if self.metrics is not None:
+            self.metrics.observe("driver.startup", time.perf_counter() - started)
+        with self._lock:
+            self._pages[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print("Failed to quit driver:", e)
+
+    @staticmethod
+    def _healthy(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("Driver pool is closed.")
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if self._healthy(driver):
+                    return driver
+                print("Replacing unresponsive driver.")
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken=False):
+        try:
+            with self._lock:
+                pages = self._pages.get(driver, 0) + 1
+                if driver in self._pages:
+                    self._pages[driver] = pages
+            if broken or self._closed or pages >= self.max_pages:
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self):
+        """Borrow a driver for one page; crashed drivers are not returned to the pool."""
+        driver = self.acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            self.release(driver, broken=True)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+        with self._lock:
+            leftover = list(self._pages)
+        for driver in leftover:
+            self._discard(driver)
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# File locking differs between POSIX and Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "embeddings"
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def text_key(model_name, text):
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on ``path`` shared with other processes (flock on POSIX, msvcrt on Windows)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingCache:
+    """On-disk embedding cache for one model, keyed by a hash of the normalized text and shared between processes."""
+
+    def __init__(self, model_name, dim, cache_dir=DEFAULT_CACHE_DIR, dtype="float16", max_entries=50000):
+        self.model_name = model_name
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.max_entries = max_entries
+        self.dir = Path(cache_dir) / re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        # vectors.bin is a memory-mapped matrix; index.json snapshots which key owns which row and
+        # index.log journals rows added since, so a write appends a line instead of rewriting the index
+        self.vectors_path = self.dir / "vectors.bin"
+        self.index_path = self.dir / "index.json"
+        self.journal_path = self.dir / "index.log"
+        self.lock_path = self.dir / "cache.lock"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._rows = 0
+        self._generation = None
+        self._journal_offset = 0
+        self._capacity = 0
+        self._vectors = None
+        with self._lock, _file_lock(self.lock_path):
+            self._sync()
+
+    def _reload(self):
+        """Read the snapshot and the whole journal; start a fresh cache if there is none or its shape differs."""
+        meta = None
+        if self.index_path.exists() and self.journal_path.exists() and self.vectors_path.exists():
+            meta = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if meta.get("dim") != self.dim or meta.get("dtype") != self.dtype.name:
+                print(f"Embedding cache at {self.dir} has a different shape, starting fresh.")
+                meta = None
+        if meta is None:
+            self._write_snapshot({}, 0, generation=0, vectors=np.empty((0, self.dim), dtype=self.dtype))
+            meta = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self._entries = {key: list(entry) for key, entry in meta["entries"].items()}
+        self._rows = meta["rows"]
+        self._generation = meta["generation"]
+        self._journal_offset = 0
+        self._vectors = None
+        self._capacity = 0
+
+    def _sync(self):
+        """Catch up with rows other processes have added; the file lock must be held."""
+        if self._generation is None or not self.journal_path.exists():
+            self._reload()
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header["generation"] != self._generation:
+                # Another process compacted the cache; its old rows are gone
+                self._reload()
+                f.seek(0)
+                f.readline()
+            if self._journal_offset:
+                f.seek(self._journal_offset)
+            for line in iter(f.readline, ""):
+                key, row, added = json.loads(line)
+                self._entries[key] = [row, added]
+                self._rows = max(self._rows, row + 1)
+            self._journal_offset = f.tell()
+        self._ensure_capacity(max(self._rows, 1024))
+
+    def _ensure_capacity(self, rows):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, self._capacity * 2)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        if os.path.getsize(self.vectors_path) < capacity * self.dim * self.dtype.itemsize:
+            os.truncate(self.vectors_path, capacity * self.dim * self.dtype.itemsize)
+        self._vectors = np.memmap(self.vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def _write_snapshot(self, entries, rows, generation, vectors):
+        """Replace vectors, snapshot and journal with a compacted copy, each swapped in with os.replace."""
+        vectors_tmp = self.vectors_path.with_suffix(".tmp")
+        vectors.astype(self.dtype).tofile(vectors_tmp)
+        meta = {"dim": self.dim, "dtype": self.dtype.name, "generation": generation, "rows": rows, "entries": entries}
+        index_tmp = self.index_path.with_suffix(".tmp")
+        index_tmp.write_text(json.dumps(meta), encoding="utf-8")
+        journal_tmp = self.journal_path.with_suffix(".log.tmp")
+        journal_tmp.write_text(json.dumps({"generation": generation}) + "\n", encoding="utf-8")
+        os.replace(vectors_tmp, self.vectors_path)
+        os.replace(index_tmp, self.index_path)
+        os.replace(journal_tmp, self.journal_path)
+
+    def key(self, text):
+        return text_key(self.model_name, text)
+
+    def get_many(self, keys):
+        """Return {key: float32 vector} for the keys already cached and count hits and misses."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                entry[1] = now
+                found[key] = np.asarray(self._vectors[entry[0]], dtype=np.float32)
+                self.hits += 1
+        return found
+
+    def put_many(self, keys, vectors):
+        now = time.time()
+        with self._lock, _file_lock(self.lock_path):
+            self._sync()
+            new = {}
+            for key, vector in zip(keys, vectors):
+                if key not in self._entries and key not in new:
+                    new[key] = vector
+            if not new:
+                return
+            if len(new) > self.max_entries:
+                new = dict(list(new.items())[-self.max_entries:])
+            if len(self._entries) + len(new) > self.max_entries:
+                self._evict(len(new))
+
+            first = self._rows
+            self._rows += len(new)
+            self._ensure_capacity(self._rows)
+            self._vectors[first:self._rows] = np.asarray(list(new.values()), dtype=self.dtype).reshape(-1, self.dim)
+            # Rows reach disk before the journal lines that point other processes at them
+            self._vectors.flush()
+            lines = []
+            for row, key in enumerate(new, first):
+                self._entries[key] = [row, now]
+                lines.append(json.dumps([key, row, now]) + "\n")
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                self._journal_offset = f.tell()
+
+    def _evict(self, incoming):
+        """Drop the least recently used tenth (or enough to fit ``incoming``) and compact; the file lock must be held."""
+        by_age = sorted(self._entries.items(), key=lambda item: item[1][1], reverse=True)
+        keep = by_age[:max(0, self.max_entries - max(incoming, self.max_entries // 10))]
+        vectors = np.array([self._vectors[row] for _, (row, _) in keep], dtype=self.dtype).reshape(-1, self.dim)
+        entries = {key: [i, last_used] for i, (key, (_, last_used)) in enumerate(keep)}
+        self._vectors = None
+        self._write_snapshot(entries, len(keep), self._generation + 1, vectors)
+        self._reload()
+        self._sync()
+
+    def flush(self):
+        """Push written vectors to disk; the journal is already up to date after every put_many."""
+        with self._lock:
+            self._vectors.flush()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+def encode_with_cache(model, texts, cache, batch_size=32):
+    """Encode texts, running the model once over the cache misses only."""
+    keys = [cache.key(text) for text in texts]
+    found = cache.get_many(keys)
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        vectors = model.encode(list(missing.values()), batch_size=batch_size)
+        found.update((key, np.asarray(vector, dtype=np.float32)) for key, vector in zip(missing, vectors))
+        cache.put_many(list(missing), vectors)
+        cache.flush()
+
+    return np.vstack([found[key] for key in keys]) if keys else np.empty((0, cache.dim), dtype=np.float32)
@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# sentence_transformers and keybert pull in torch, so they are imported on first
+# use rather than here; importing this module stays cheap.
+
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+# "torch" runs SentenceTransformer; "onnx" runs the int8 export from onnx_encoder.py
+ENCODER_BACKEND = os.environ.get("ENCODER_BACKEND", "torch")
+
+_lock = threading.RLock()
+_sentence_models = {}
+_keybert_models = {}
+
+# Seconds spent importing and loading each component, for startup reports;
+# read it through load_times() while models may still be loading
+LOAD_TIMES = {}
+_times_lock = threading.Lock()
+
+
+@contextmanager
+def _timed(component):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _times_lock:
+            LOAD_TIMES[component] = round(time.perf_counter() - started, 3)
+
+
+def load_times():
+    """Snapshot of LOAD_TIMES that is safe to iterate while another thread loads models."""
+    with _times_lock:
+        return dict(LOAD_TIMES)
+
+
+def get_sentence_model(model_name=MODEL_NAME, backend=None):
+    """Return the process-wide encoder for model_name, loading it on first use.
+
+    With the onnx backend this is an OnnxSentenceEncoder, which offers the same
+    encode/tokenizer/dimension surface as a SentenceTransformer.
+    """
+    backend = backend or ENCODER_BACKEND
+    with _lock:
+        if (model_name, backend) not in _sentence_models:
+            if backend == "onnx":
+                with _timed("import onnxruntime"):
+                    from onnx_encoder import OnnxSentenceEncoder
+                with _timed(f"load {model_name} (onnx)"):
+                    _sentence_models[model_name, backend] = OnnxSentenceEncoder(model_name)
+            else:
+                with _timed("import sentence_transformers"):
+                    from sentence_transformers import SentenceTransformer
+                with _timed(f"load {model_name} (torch)"):
+                    _sentence_models[model_name, backend] = SentenceTransformer(model_name)
+        return _sentence_models[model_name, backend]
+
+
+def get_keybert(model_name=MODEL_NAME, backend=None):
+    # KeyBERT wraps the shared encoder instead of loading a second copy of the weights.
+    backend = backend or ENCODER_BACKEND
+    with _lock:
+        if (model_name, backend) not in _keybert_models:
+            model = get_sentence_model(model_name, backend)
+            with _timed("import keybert"):
+                from keybert import KeyBERT
+            if backend != "torch":
+                model = _keybert_embedder(model)
+            _keybert_models[model_name, backend] = KeyBERT(model=model)
+        return _keybert_models[model_name, backend]
+
+
+def warm_models(model_name=MODEL_NAME, backend=None):
+    """Load the encoder and KeyBERT ahead of first use; safe to run in a background thread."""
+    get_keybert(model_name, backend)
+
+
+def _keybert_embedder(model):
+    from keybert.backend import BaseEmbedder
+
+    class Embedder(BaseEmbedder):
+        def embed(self, documents, verbose=False):
+            return model.encode(list(documents))
+
+    return Embedder()
+
+
+class ChunkedEncoder:
+    """Encode long documents without silent truncation.
+
+    Each text is split into chunks that fit the model's sequence limit, chunks
+    are grouped into token-length buckets so batches carry little padding, and
+    each bucket is encoded with a batch size sized to a fixed token budget.
+    Chunk vectors are pooled back into one vector per text, either as a
+    token-weighted mean or an element-wise max.
+
+    Exposes ``encode`` and ``get_sentence_embedding_dimension`` so it can stand
+    in for a SentenceTransformer wherever one is passed around.
+    """
+
+    def __init__(self, model, model_name=MODEL_NAME, chunk_tokens=None, pooling="mean",
+                 buckets=(32, 64, 128, 256), token_budget=8192):
+        self.model = model
+        self.model_name = model_name
+        # Leave room for [CLS]/[SEP] and a few tokens of re-tokenisation drift
+        self.chunk_tokens = chunk_tokens or model.get_max_seq_length() - 6
+        self.pooling = pooling
+        self.buckets = buckets
+        self.token_budget = token_budget
+
+    @property
+    def name(self):
+        return f"{self.model_name}-chunk{self.chunk_tokens}-{self.pooling}"
+
+    def get_sentence_embedding_dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def plan(self, texts):
+        """Split texts into chunks and group them into length-bucketed batches.
+
+        Returns (chunks, owners, lengths, batches) where batches is a list of
+        lists of chunk indices.
+        """
+        token_ids = self.model.tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+        chunks, owners, lengths = [], [], []
+        for owner, (text, ids) in enumerate(zip(texts, token_ids)):
+            if len(ids) <= self.chunk_tokens:
+                chunks.append(text)
+                owners.append(owner)
+                lengths.append(len(ids) + 2)
+                continue
+            for start in range(0, len(ids), self.chunk_tokens):
+                piece = ids[start:start + self.chunk_tokens]
+                chunks.append(self.model.tokenizer.decode(piece))
+                owners.append(owner)
+                lengths.append(len(piece) + 2)
+
+        batches = []
+        order = sorted(range(len(chunks)), key=lambda i: lengths[i])
+        bucket_of = lambda length: next((b for b in self.buckets if length <= b), self.buckets[-1])
+        current, current_bucket = [], None
+        for i in order:
+            bucket = bucket_of(lengths[i])
+            batch_size = max(1, self.token_budget // bucket)
+            if current and (bucket != current_bucket or len(current) >= batch_size):
+                batches.append(current)
+                current = []
+            current.append(i)
+            current_bucket = bucket
+        if current:
+            batches.append(current)
+        return chunks, owners, lengths, batches
+
+    def encode(self, texts, batch_size=None, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        dim = self.get_sentence_embedding_dimension()
+        if not texts:
+            return np.empty((0, dim), dtype=np.float32)
+
+        chunks, owners, lengths, batches = self.plan(texts)
+        chunk_vectors = np.empty((len(chunks), dim), dtype=np.float32)
+        for batch in batches:
+            chunk_vectors[batch] = self.model.encode([chunks[i] for i in batch], batch_size=len(batch), **kwargs)
+
+        owners = np.asarray(owners)
+        if self.pooling == "max":
+            pooled = np.full((len(texts), dim), -np.inf, dtype=np.float32)
+            np.maximum.at(pooled, owners, chunk_vectors)
+        else:
+            weights = np.asarray(lengths, dtype=np.float32)[:, None]
+            pooled = np.zeros((len(texts), dim), dtype=np.float32)
+            np.add.at(pooled, owners, chunk_vectors * weights)
+            totals = np.zeros(len(texts), dtype=np.float32)
+            np.add.at(totals, owners, weights[:, 0])
+            pooled /= totals[:, None]
+        return pooled[0] if single else pooled
+
+
+def padding_waste(lengths, batches):
+    """Fraction of token slots in the padded batches that are padding."""
+    padded = sum(max(lengths[i] for i in batch) * len(batch) for batch in batches)
+    return 1 - sum(lengths[i] for batch in batches for i in batch) / padded if padded else 0.0
+
+
+def cosine_scores(query, vectors):
+    """Cosine similarity of one query vector against each row of vectors."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    query = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    return vectors @ query / np.maximum(norms, 1e-12)
+
+
+def get_document_encoder(model_name=MODEL_NAME, pooling="mean", backend=None):
+    backend = backend or ENCODER_BACKEND
+    # Quantised vectors differ slightly, so they get their own embedding-cache namespace
+    name = model_name if backend == "torch" else f"{model_name}-{backend}-int8"
+    return ChunkedEncoder(get_sentence_model(model_name, backend), model_name=name, pooling=pooling)
@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import uuid
+from collections import deque
+
+from crawl_metrics import CrawlMetrics, DEFAULT_METRICS_DIR
+from job_store import DEFAULT_DB_PATH
+
+
+# Browsers one app process may run at once, however many sessions are searching
+DEFAULT_MAX_BROWSERS = int(os.environ.get("INGEST_MAX_BROWSERS", "4"))
+QUERY_FIELDS = ("keywords", "location", "min_salary", "max_salary", "region", "max_jobs")
+
+
+class IngestTicket:
+    """One search request's place in the ingest queue; sessions poll it instead of blocking on the crawl."""
+
+    def __init__(self, key, query, options, screen=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.query = query
+        self.options = options
+        self.screen = screen
+        self.status = "queued"  # queued -> running -> done | failed
+        self.progress = (0, 0)
+        self.error = None
+        self.metrics = None
+        self.subscribers = 1
+        self._jobs = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def add_job(self, job):
+        with self._lock:
+            self._jobs.append(job)
+
+    def poll(self, since=0):
+        """Jobs that arrived after the first ``since``, as copies so sessions can annotate them freely."""
+        with self._lock:
+            return [dict(job) for job in self._jobs[since:]]
+
+
+class IngestQueue:
+    """Single background worker that runs every session's Seek searches on at most ``max_browsers`` browsers."""
+
+    def __init__(self, max_browsers=DEFAULT_MAX_BROWSERS, max_batch=4, crawl=None, db_path=DEFAULT_DB_PATH,
+                 metrics_dir=DEFAULT_METRICS_DIR):
+        self.max_browsers = max(1, max_browsers)
+        self.max_batch = max(1, max_batch)
+        self.crawl = crawl
+        self.db_path = db_path
+        self.metrics_dir = metrics_dir
+        self._pending = deque()
+        self._in_flight = {}  # request key -> ticket
+        self._cond = threading.Condition()
+        self._worker = None
+
+    def submit(self, query, threads=1, engine="selenium", enrich_top_k=None, screen=None, screen_key=None):
+        """Queue a search, or join an identical one in flight; returns its ticket."""
+        query = {field: query.get(field) for field in QUERY_FIELDS}
+        # screen_key (e.g. the resume's hash) stands in for the screen function, so screened searches can be shared too
+        options = {"engine": engine, "enrich_top_k": enrich_top_k if screen else None, "screen_key": screen_key if screen else None}
+        key = json.dumps([query, options], sort_keys=True, default=str)
+        with self._cond:
+            ticket = self._in_flight.get(key)
+            if ticket is not None:
+                ticket.subscribers += 1
+                return ticket
+            ticket = IngestTicket(key, query, {**options, "threads": threads}, screen)
+            self._in_flight[key] = ticket
+            self._pending.append(ticket)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="ingest-queue", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return ticket
+
+    def position(self, ticket):
+        """How many queued requests are ahead of ``ticket`` (0 once it is running)."""
+        with self._cond:
+            return self._pending.index(ticket) if ticket in self._pending else 0
+
+    def _next_batch(self):
+        # Queued requests that share crawl options run as one batch, so an ad found by overlapping searches is opened once
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            first = self._pending.popleft()
+            group = {key: value for key, value in first.options.items() if key != "threads"}
+            batch = [first]
+            for ticket in list(self._pending):
+                if len(batch) >= self.max_batch:
+                    break
+                if {key: value for key, value in ticket.options.items() if key != "threads"} == group:
+                    self._pending.remove(ticket)
+                    batch.append(ticket)
+            for ticket in batch:
+                ticket.status = "running"
+            return batch
+
+    def _run(self):
+        # One crawl at a time keeps the browser count bounded however many sessions are connected
+        while True:
+            batch = self._next_batch()
+            try:
+                self._crawl_batch(batch)
+            except Exception as e:
+                # Whatever went wrong, the batch's sessions must stop waiting and the worker must live on
+                print(f"❌ Ingest batch failed: {e}")
+                self._finish(batch, CrawlMetrics().summary(), str(e))
+
+    def _crawl_batch(self, batch):
+        tickets = {ticket.id: ticket for ticket in batch}
+        first = batch[0]
+        metrics = CrawlMetrics()
+
+        def report_progress(done, total):
+            for ticket in batch:
+                ticket.progress = (done, total)
+
+        threads = min(self.max_browsers, max(ticket.options["threads"] for ticket in batch))
+        error = None
+        try:
+            crawl = self.crawl
+            if crawl is None:
+                from ingest_seek_selenium import iter_crawl as crawl
+            for names, job in crawl(
+                [{**ticket.query, "name": ticket.id} for ticket in batch],
+                threads=threads,
+                page_workers=min(2, self.max_browsers),
+                parallel_queries=len(batch),
+                engine=first.options["engine"],
+                screen=first.screen,
+                enrich_top_k=first.options["enrich_top_k"],
+                progress=report_progress,
+                metrics=metrics,
+                db_path=self.db_path,
+                metrics_dir=self.metrics_dir,
+            ):
+                for name in names:
+                    tickets[name].add_job(job)
+        except Exception as e:
+            print(f"❌ Ingest batch failed: {e}")
+            error = str(e)
+
+        self._finish(batch, metrics.summary(), error)
+
+    def _finish(self, batch, summary, error):
+        with self._cond:
+            for ticket in batch:
+                ticket.metrics = summary
+                ticket.error = error
+                ticket.status = "failed" if error else "done"
+                self._in_flight.pop(ticket.key, None)
@@ -3,8 +3,29 @@ from bs4 import BeautifulSoup
 import json
 import time
 import argparse
+import asyncio
+import re
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+
+from rate_limit import backoff_delay
 
 BASE_URL = "https://www.seek.com.au"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Accept-Language": "en-AU,en;q=0.9",
+}
+DETAIL_CONCURRENCY_PER_HOST = 8
+DETAIL_TIMEOUT = 15
+DETAIL_RETRIES = 3
+# Statuses Seek uses when it wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+DETAIL_FIELDS = ("description", "company", "location", "date_posted", "salary")
+# Seek server-renders its Redux store into every search and job page
+STATE_MARKER = "window.SEEK_REDUX_DATA"
 
 def build_search_url(keywords, location, industry, min_salary, max_salary, page=1):
     url = f"{BASE_URL}/jobs?"
@@ -40,10 +61,12 @@ def parse_job_card(card):
 def fetch_seek_jobs(keywords="", location="", industry="", min_salary=None, max_salary=None, max_results=200):
     jobs = []
     page = 1
+    session = requests.Session()
+    session.headers.update(HEADERS)
     while len(jobs) < max_results:
         url = build_search_url(keywords, location, industry, min_salary, max_salary, page)
         print(f"Fetching page {page}: {url}")
-        resp = requests.get(url)
+        resp = session.get(url)
         if resp.status_code != 200:
             print(f"Failed to fetch page {page}")
             break
@@ -59,6 +82,221 @@ def fetch_seek_jobs(keywords="", location="", industry="", min_salary=None, max_
         time.sleep(1)
     return jobs
 
+
+def _text(soup, tag, automation):
+    elem = soup.find(tag, {"data-automation": automation})
+    return elem.get_text(" ", strip=True) if elem else None
+
+
+def extract_page_state(html):
+    """Return the JSON state a Seek page embeds as window.SEEK_REDUX_DATA, or None."""
+    start = html.find(STATE_MARKER)
+    start = html.find("{", start) if start >= 0 else -1
+    if start < 0:
+        return None
+    end = html.find("</script>", start)
+    # The store is a JS object literal; `undefined` is the only non-JSON value it uses
+    text = re.sub(r"(?<=[:,\[])\s*undefined(?=\s*[,}\]])", "null", html[start:end if end > 0 else None])
+    try:
+        state, _ = json.JSONDecoder().raw_decode(text)
+    except ValueError:
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _dig(data, *keys):
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _label(value):
+    if isinstance(value, list):
+        return _label(value[0]) if value else None
+    if isinstance(value, dict):
+        return value.get("label") or value.get("name") or value.get("description")
+    return value or None
+
+
+def jobs_from_search_state(state, base_url=BASE_URL):
+    """Listing fields for every job in a search page's embedded state, in page order."""
+    jobs = []
+    for item in _dig(state, "results", "results", "jobs") or []:
+        if not isinstance(item, dict) or not item.get("id"):
+            continue
+        job = {"title": item.get("title") or "N/A", "link": f"{base_url}/job/{item['id']}"}
+        fields = {
+            "company": item.get("companyName") or _label(item.get("advertiser")),
+            "location": _label(item.get("locations")) or _label(item.get("location")),
+            "date_posted": item.get("listingDateDisplay"),
+            "salary": _label(item.get("salaryLabel") or item.get("salary")),
+            "teaser": item.get("teaser"),
+        }
+        job.update((field, value) for field, value in fields.items() if value)
+        jobs.append(job)
+    return jobs
+
+
+def detail_from_state(state):
+    """Whichever DETAIL_FIELDS a job page's embedded state provides."""
+    job = _dig(state, "jobdetails", "result", "job")
+    if not isinstance(job, dict):
+        return {}
+    content = job.get("content")
+    fields = {
+        "description": BeautifulSoup(content, "html.parser").get_text("\n", strip=True) if content else None,
+        "company": _label(job.get("advertiser")),
+        "location": _label(job.get("location")),
+        "date_posted": _label(job.get("listedAt")),
+        "salary": _label(job.get("salary")),
+    }
+    return {field: value for field, value in fields.items() if value}
+
+
+def parse_job_detail(html):
+    """Extract the fields enrich_single_job reads from a server-rendered ad page.
+
+    The embedded page state is read first; the DOM is only consulted for
+    fields it lacks. Returns None when there is no ad body either way, i.e.
+    the page needs JavaScript.
+    """
+    detail = detail_from_state(extract_page_state(html))
+    if all(field in detail for field in DETAIL_FIELDS):
+        return detail
+
+    soup = BeautifulSoup(html, "html.parser")
+    details = soup.find("div", {"data-automation": "jobAdDetails"})
+    if details is None and "description" not in detail:
+        return None
+    dom = {
+        "description": details.get_text("\n", strip=True) if details else None,
+        "company": _text(soup, True, "advertiser-name"),
+        "location": _text(soup, True, "job-detail-location"),
+        "date_posted": _text(soup, "span", "jobListingDate"),
+        "salary": _text(soup, True, "job-detail-salary"),
+    }
+    return {field: detail.get(field) or dom[field] or "N/A" for field in DETAIL_FIELDS}
+
+
+def _retry_after(resp):
+    try:
+        return float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+async def _fetch_detail(client, host_limits, job, limiter=None):
+    """Fetch one ad page, retrying throttled or failed requests with jittered backoff."""
+    host = urlsplit(job["link"]).netloc
+    for attempt in range(1, DETAIL_RETRIES + 1):
+        if limiter:
+            await limiter.acquire_async()
+        started = time.perf_counter()
+        wait = None
+        try:
+            async with host_limits[host]:
+                resp = await client.get(job["link"])
+            if resp.status_code not in THROTTLE_STATUSES:
+                resp.raise_for_status()
+                if limiter:
+                    limiter.record(time.perf_counter() - started)
+                return job, parse_job_detail(resp.text)
+            wait = _retry_after(resp)
+            error = f"HTTP {resp.status_code}"
+        except httpx.HTTPStatusError as e:
+            # Other 4xx/5xx responses won't improve on retry
+            print(f"HTTP fetch failed for {job['title']}: {e}")
+            return job, None
+        except httpx.TransportError as e:
+            error = e
+
+        if limiter:
+            limiter.record(throttled=True)
+        if attempt < DETAIL_RETRIES:
+            await asyncio.sleep(wait if wait is not None else backoff_delay(attempt))
+
+    print(f"HTTP fetch failed for {job['title']}: {error}")
+    return job, None
+
+
+async def fetch_job_details_async(jobs, per_host=DETAIL_CONCURRENCY_PER_HOST, timeout=DETAIL_TIMEOUT, limiter=None):
+    # One pooled client for the whole batch; the semaphores cap in-flight requests per host.
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+    limits = httpx.Limits(max_connections=per_host * 2, max_keepalive_connections=per_host)
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=timeout, follow_redirects=True) as client:
+        return await asyncio.gather(*(_fetch_detail(client, host_limits, job, limiter) for job in jobs))
+
+
+class DetailFetcher:
+    """One pooled HTTP client and one set of per-host limits for a whole crawl.
+
+    The client runs on an event loop in a background thread, and ``fetch``
+    may be called from any number of worker threads. However many threads
+    fetch at once, only ``per_host`` requests per host are in flight and
+    connections are reused between calls.
+    """
+
+    def __init__(self, per_host=DETAIL_CONCURRENCY_PER_HOST, timeout=DETAIL_TIMEOUT, limiter=None, transport=None):
+        self.per_host = per_host
+        self.transport = transport
+        self.timeout = timeout
+        self.limiter = limiter
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="detail-http", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(), self.loop).result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def _open(self):
+        self._host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        limits = httpx.Limits(max_connections=self.per_host * 2, max_keepalive_connections=self.per_host)
+        self._client = httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=self.timeout, follow_redirects=True,
+                                         transport=self.transport)
+
+    async def _fetch_all(self, jobs):
+        return await asyncio.gather(*(_fetch_detail(self._client, self._host_limits, job, self.limiter) for job in jobs))
+
+    def fetch(self, jobs):
+        """[(job, detail or None)] for the given jobs, blocking the calling thread until all are done."""
+        return asyncio.run_coroutine_threadsafe(self._fetch_all(jobs), self.loop).result()
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+def fetch_job_details(jobs, per_host=DETAIL_CONCURRENCY_PER_HOST, limiter=None, fetcher=None):
+    """Enrich jobs over pooled HTTP, pacing requests through the optional shared RateLimiter.
+
+    Pass a DetailFetcher to share its client and per-host limits with other
+    calls; otherwise a client is opened for this call alone. Returns
+    (enriched, needs_browser); the second list holds jobs whose pages could
+    not be fetched or parsed without a browser.
+    """
+    enriched = []
+    needs_browser = []
+    if fetcher is not None:
+        results = fetcher.fetch(jobs)
+    else:
+        results = asyncio.run(fetch_job_details_async(jobs, per_host, limiter=limiter))
+    for job, detail in results:
+        if detail:
+            enriched.append({**job, **detail})
+        else:
+            needs_browser.append(job)
+    return enriched, needs_browser
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--keywords", type=str, default="")
@@ -1,26 +1,52 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 import time
 import json
 import argparse
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import JavascriptException, TimeoutException, NoSuchElementException, WebDriverException
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from webdriver_manager.chrome import ChromeDriverManager
-
-
-from urllib.parse import quote_plus
+from collections import defaultdict, deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from functools import partial
+import math
+import queue
+import threading
+
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_metrics import CrawlMetrics, DEFAULT_METRICS_DIR, format_summary
+from driver_pool import DriverPool
+from ingest_seek import (
+    DETAIL_CONCURRENCY_PER_HOST, DETAIL_FIELDS, DetailFetcher, STATE_MARKER, detail_from_state, fetch_job_details, jobs_from_search_state,
+)
+from job_export import JsonlWriter
+from job_store import JobStore, DEFAULT_DB_PATH, canonical_link
+from rate_limit import DEFAULT_RATE, RateLimiter, backoff_delay
+
+
+from urllib.parse import quote_plus, urlsplit
 
 import time
 
-start = time.time()
-MAX_PAGE_RETRIES = 2
-DETAIL_RETRIES = 2
+MAX_PAGE_RETRIES = 3
+DETAIL_RETRIES = 3
+# Browsers a listing page may crash before it counts as failed
+LISTING_DRIVER_ATTEMPTS = 2
+# Cards on a full Seek results page, used to guess how many pages max_jobs needs
+SEEK_PAGE_SIZE = 22
+JOB_CARD_SELECTOR = "a[data-automation='jobTitle']"
+JOB_DETAIL_SELECTOR = "div[data-automation='jobAdDetails']"
+DETAIL_SELECTORS = {
+    "description": JOB_DETAIL_SELECTOR,
+    "company": "[data-automation='advertiser-name']",
+    "location": "[data-automation='job-detail-location']",
+    "date_posted": 'span[data-automation="jobListingDate"]',
+    "salary": "[data-automation='job-detail-salary']",
+}
+REQUIRED_DETAIL_FIELDS = ("description", "company", "location")
+# Page titles Seek's CDN serves instead of the page when it throttles us
+BLOCK_MARKERS = ("access denied", "too many requests", "request blocked")
 
 
 def build_url(keywords="", location="", min_salary=None, max_salary=None, page=1, region="Australia"):
@@ -36,175 +62,573 @@ def build_url(keywords="", location="", min_salary=None, max_salary=None, page=1
 
 
 
-def fetch_jobs(driver, max_jobs=20):
-    jobs = []
-    page = 1
-    fetch_start = None
-    while len(jobs) < max_jobs:
-        fetch_start = time.time()
-        url = build_url(args.keywords, args.location, args.min_salary, args.max_salary, page, args.region)
-        print(f"Visiting {url}")
-
-        loaded = False
-        for attempt in range(1, MAX_PAGE_RETRIES + 1):
-            driver.get(url)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+def page_state(driver):
+    """The page's embedded SEEK_REDUX_DATA state, or None."""
+    try:
+        raw = driver.execute_script(f"return {STATE_MARKER} ? JSON.stringify({STATE_MARKER}) : null")
+    except JavascriptException:
+        return None
+    return json.loads(raw) if raw else None
+
+
+def _ready_or_blocked(selector):
+    def check(driver):
+        if driver.find_elements(By.CSS_SELECTOR, selector) or driver.execute_script(f"return !!{STATE_MARKER}"):
+            return "ready"
+        title = (driver.title or "").lower()
+        return "blocked" if any(marker in title for marker in BLOCK_MARKERS) else False
+    return check
+
+
+def _count_settled(selector):
+    counts = []
+
+    def check(driver):
+        counts.append(len(driver.find_elements(By.CSS_SELECTOR, selector)))
+        return len(counts) > 1 and counts[-1] == counts[-2] > 0
+    return check
+
+
+def load_page(driver, url, selector, timeout, stage, limiter, metrics):
+    """Navigate once the rate limiter allows it and wait for selector; raises TimeoutException if it never shows or Seek blocks us."""
+    waited = limiter.acquire()
+    if waited:
+        metrics.observe(f"{stage}.rate_wait", waited)
+    started = time.perf_counter()
+    with metrics.span(f"{stage}.navigate"):
+        driver.get(url)
+    try:
+        with metrics.span(f"{stage}.wait"):
+            state = WebDriverWait(driver, timeout, poll_frequency=0.2).until(_ready_or_blocked(selector))
+    except TimeoutException:
+        if limiter.record(throttled=True):
+            metrics.count("rate.slowdown")
+        raise
+    if state == "blocked":
+        metrics.count(f"{stage}.throttled")
+        if limiter.record(throttled=True):
+            metrics.count("rate.slowdown")
+        raise TimeoutException(f"Throttled on {url}")
+    if limiter.record(time.perf_counter() - started):
+        metrics.count("rate.slowdown")
+
+
+def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+    """Load one search-results page and return its [{title, link}] cards, or None if it never loaded."""
+    metrics = metrics or CrawlMetrics()
+    limiter = limiter or RateLimiter()
+    page_start = time.perf_counter()
+    print(f"Visiting {url}")
+
+    loaded = False
+    for attempt in range(1, MAX_PAGE_RETRIES + 1):
+        try:
+            load_page(driver, url, JOB_CARD_SELECTOR, 20, "listing", limiter, metrics)
+            loaded = True
+            break
+        except TimeoutException:
+            metrics.count("listing.timeout")
+            print(f"Job titles not loaded (attempt {attempt}/{MAX_PAGE_RETRIES}).")
+            if attempt < MAX_PAGE_RETRIES:
+                with metrics.span("listing.retry"):
+                    time.sleep(backoff_delay(attempt))
+
+    if not loaded:
+        metrics.count("listing.failure")
+        return None
+
+    # 🔍 Dump the HTML of the first page for inspection
+    if page == 1:
+        debug_path = Path(__file__).resolve().parent.parent / "seek_debug_page1.html"
+        with open(debug_path, "w", encoding="utf-8") as f:
+            f.write(driver.page_source)
+
+    # The embedded state carries every card's fields at once, with no rendering to wait for
+    parts = urlsplit(url)
+    with metrics.span("listing.extract"):
+        jobs = jobs_from_search_state(page_state(driver), f"{parts.scheme}://{parts.netloc}")
+    if jobs:
+        metrics.count("listing.success")
+        metrics.count("listing.from_state")
+        metrics.observe("listing.page", time.perf_counter() - page_start)
+        return jobs
+
+    metrics.count("listing.dom_fallback")
+    # Cards below the fold render lazily; scroll and wait until their count stops changing
+    with metrics.span("listing.settle"):
+        try:
+            WebDriverWait(driver, 20, poll_frequency=0.2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, JOB_CARD_SELECTOR))
+            )
+        except TimeoutException:
+            metrics.count("listing.failure")
+            return None
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, 3, poll_frequency=0.25).until(_count_settled(JOB_CARD_SELECTOR))
+        except TimeoutException:
+            pass
+    metrics.count("listing.success")
 
-            # Wait until job titles are visible
-            try:
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "a[data-automation='jobTitle']"))
-                )
-                print("Job cards are now visible.")
-                loaded = True
-                break
-            except TimeoutException:
-                print(f"Job titles not loaded (attempt {attempt}/{MAX_PAGE_RETRIES}).")
-                time.sleep(2)
-
-        if not loaded:
-            return []
-
-        # 🔍 Dump the HTML of the first page for inspection
-        if page == 1:
-            debug_path = Path(__file__).resolve().parent.parent / "seek_debug_page1.html"
-            with open(debug_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-
-
-        job_elements = driver.find_elements(By.CSS_SELECTOR, "a[data-automation='jobTitle']")
-
-        for title_elem in job_elements:
-            if len(jobs) >= max_jobs:
-                break
+    with metrics.span("listing.extract"):
+        for title_elem in driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR):
             try:
-                title = title_elem.text
-                link = title_elem.get_attribute("href")
-
                 jobs.append({
-                    "title": title,
-                    "link": link
+                    "title": title_elem.text,
+                    "link": title_elem.get_attribute("href")
                 })
             except Exception as e:
                 print("Skipping job due to:", e)
 
-        print("Time to fetch job ", len(jobs), ":", time.time() - fetch_start, "s")
+    metrics.observe("listing.page", time.perf_counter() - page_start)
+    return jobs
 
-        if len(jobs) >= max_jobs:
-            break
 
-        page += 1
-        time.sleep(2)
+def _new_jobs(page_jobs, seen):
+    """Jobs from one page whose links haven't been seen on earlier pages (promoted ads repeat)."""
+    new = []
+    for job in page_jobs:
+        if not job.get("link"):
+            continue
+        link = canonical_link(job["link"])
+        if link not in seen:
+            seen.add(link)
+            new.append(job)
+    return new
 
-    return jobs
 
+class ListingIncomplete(Exception):
+    """A listing crawl stopped at a page that never loaded, short of max_jobs and the end of the results."""
 
-def enrich_single_job(job):
-    local_driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    local_driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    result = {}
+    def __init__(self, page):
+        super().__init__(f"Page {page} failed to load")
+        self.page = page
 
-    try:
-        enrich_start = time.time()
 
-        for attempt in range(1, DETAIL_RETRIES + 1):
-            local_driver.get(job["link"])
-            try:
-                WebDriverWait(local_driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-automation='jobAdDetails']"))
-                )
-                break
-            except TimeoutException:
-                if attempt == DETAIL_RETRIES:
-                    raise
-                time.sleep(2)
-
-        result.update(job)
-        result["description"] = local_driver.find_element(By.CSS_SELECTOR, "div[data-automation='jobAdDetails']").text
-        result["company"] = local_driver.find_element(By.CSS_SELECTOR, "[data-automation='advertiser-name']").text
-        result["location"] = local_driver.find_element(By.CSS_SELECTOR, "[data-automation='job-detail-location']").text
+def _fetch_listing_leased(pool, url, page, metrics, limiter):
+    for attempt in range(1, LISTING_DRIVER_ATTEMPTS + 1):
         try:
-            result["date_posted"] = local_driver.find_element(By.CSS_SELECTOR, 'span[data-automation="jobListingDate"]').text
-        except:
-            result["date_posted"] = "N/A"
-        print("Time to enrich job - ", job['title'], ": started at (offset) ",  time.time() - start, ", runtime ", time.time() - enrich_start, "s")
+            with pool.lease() as driver:
+                return fetch_listing_page(driver, url, page, metrics, limiter)
+        except WebDriverException as e:
+            # The lease has discarded the crashed driver, so the retry gets a fresh one
+            metrics.count("driver.crash")
+            print(f"❌ Driver crashed on page {page} (attempt {attempt}/{LISTING_DRIVER_ATTEMPTS}) — {e}")
+    metrics.count("listing.failure")
+    return None
+
+
+def iter_listing_pages(pool, keywords="", location="", min_salary=None, max_salary=None, region="Australia",
+                       max_jobs=20, page_workers=2, metrics=None, limiter=None, start_page=1, seen=None):
+    """Yield each search-results page's new jobs in page order, fetched on up to page_workers pooled drivers."""
+    metrics = metrics or CrawlMetrics()
+    limiter = limiter or RateLimiter()
+    seen = set(seen or ())
+    collected = 0
+    page_sizes = []
+    in_flight = deque()
+    next_page = start_page
+    executor = ThreadPoolExecutor(max(1, page_workers), thread_name_prefix="listing")
+
+    # Only as many pages go in flight as max_jobs still seems to need
+    def pages_wanted():
+        per_page = sum(page_sizes) / len(page_sizes) if page_sizes else SEEK_PAGE_SIZE
+        return min(max(1, page_workers), math.ceil((max_jobs - collected) / max(per_page, 1)))
 
-    except Exception as e:
-        print(f"❌ Error on job: {job['title']} — {e}")
+    try:
+        while collected < max_jobs:
+            while len(in_flight) < pages_wanted():
+                url = build_url(keywords, location, min_salary, max_salary, next_page, region)
+                in_flight.append((next_page, executor.submit(_fetch_listing_leased, pool, url, next_page, metrics, limiter)))
+                next_page += 1
+
+            page, future = in_flight.popleft()
+            page_jobs = future.result()
+            if page_jobs is None:
+                # Not the end of the results, so the caller mustn't count the search as listed
+                raise ListingIncomplete(page)
+            page_sizes.append(len(page_jobs))
+            new = _new_jobs(page_jobs, seen)[:max_jobs - collected]
+            if not new:
+                # Seek repeats its last page past the end of the results
+                print(f"Page {page} has no new jobs, stopping.")
+                return
+            collected += len(new)
+            yield new
     finally:
-        local_driver.quit()
+        executor.shutdown(wait=True, cancel_futures=True)
 
-    return result
 
-def enrich_jobs_parallel(jobs, max_threads=5):
-    enriched = []
-    with ThreadPoolExecutor(max_threads) as executor:
-        futures = {executor.submit(enrich_single_job, job): job for job in jobs}
-        for i, future in enumerate(as_completed(futures)):
-            enriched_job = future.result()
-            if enriched_job:
-                enriched.append(enriched_job)
-            print(f"Enriched job {i+1}/{len(jobs)}")
-    return enriched
+def enrich_single_job(job, driver, metrics=None, limiter=None, failures=None):
+    """Load one ad and read its details; returns {} on failure, recording why in ``failures`` (link -> reason) if given."""
+    metrics = metrics or CrawlMetrics()
+    limiter = limiter or RateLimiter()
+    result = {}
 
+    try:
+        with metrics.span("detail.job"):
+            for attempt in range(1, DETAIL_RETRIES + 1):
+                try:
+                    load_page(driver, job["link"], JOB_DETAIL_SELECTOR, 10, "detail", limiter, metrics)
+                    break
+                except TimeoutException:
+                    metrics.count("detail.timeout")
+                    if attempt == DETAIL_RETRIES:
+                        raise
+                    with metrics.span("detail.retry"):
+                        time.sleep(backoff_delay(attempt))
+
+            with metrics.span("detail.extract"):
+                result.update(job)
+                result.update(extract_detail(driver, metrics))
+
+    except (TimeoutException, NoSuchElementException) as e:
+        metrics.count("detail.failure")
+        print(f"❌ Error on job: {job['title']} — {e}")
+        if failures is not None:
+            failures[canonical_link(job["link"])] = f"{type(e).__name__}: {str(e).strip() or 'no details'}"
+        return {}
 
-def enrich_jobs(driver, jobs):
-    print(f"\nVisiting {len(jobs)} job detail pages to extract more info...\n")
-    enrich_start = None
-    enriched = []
+    metrics.count("detail.success")
+    return result
 
-    for job in jobs:
-        enrich_start = time.time()
 
+def extract_detail(driver, metrics):
+    """Read DETAIL_FIELDS from the page state, scraping the DOM only for the ones it lacks."""
+    detail = detail_from_state(page_state(driver))
+    missing = [field for field in DETAIL_FIELDS if field not in detail]
+    if not missing:
+        return detail
+
+    metrics.count("detail.dom_fallback")
+    if "description" in missing:
+        # The state was ready before the ad body rendered
+        WebDriverWait(driver, 10, poll_frequency=0.2).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, JOB_DETAIL_SELECTOR))
+        )
+    for field in missing:
         try:
-            driver.get(job["link"])
-            time.sleep(3)
+            detail[field] = driver.find_element(By.CSS_SELECTOR, DETAIL_SELECTORS[field]).text
+        except NoSuchElementException:
+            if field in REQUIRED_DETAIL_FIELDS:
+                raise
+            detail[field] = "N/A"
+    return detail
 
-            # Wait for the job description to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-automation='jobAdDetails']"))
-            )
-
-            try:
-                description = driver.find_element(By.CSS_SELECTOR, "div[data-automation='jobAdDetails']").text
-            except:
-                description = ""
-
-            try:
-                company = driver.find_element(By.CSS_SELECTOR, "[data-automation='advertiser-name']").text
-            except:
-                company = "N/A"
-
-            try:
-                location = driver.find_element(By.CSS_SELECTOR, "[data-automation='job-detail-location']").text
-            except:
-                location = "N/A"
-
-            try:
-                date_element = driver.find_element(By.CSS_SELECTOR, 'span[data-automation="jobListingDate"]')
-                date_posted = date_element.text  # e.g., "Posted 3 days ago"
-            except Exception as e:
-                date_posted = 'N/A'
-
-
-            job.update({
-                "description": description,
-                "company": company,
-                "location": location,
-                "date_posted": date_posted
-            })
-
-            enriched.append(job)
-            print(f"Enriched: {job['title']}")
 
+def enrich_with_pool(job, pool, metrics=None, limiter=None, failures=None):
+    try:
+        with pool.lease() as driver:
+            return enrich_single_job(job, driver, metrics, limiter, failures)
+    except WebDriverException as e:
+        # The lease has already discarded the crashed driver; the next job gets a fresh one.
+        if metrics is not None:
+            metrics.count("detail.failure")
+            metrics.count("driver.crash")
+        print(f"❌ Driver crashed on job: {job['title']} — {e}")
+        if failures is not None:
+            failures[canonical_link(job["link"])] = f"driver crashed: {str(e).strip() or type(e).__name__}"
+        return {}
+
+
+def iter_enrich_http(jobs, pool, fetcher, metrics=None, limiter=None, failures=None):
+    """Enrich jobs through the crawl's shared DetailFetcher, opening a pooled browser only for pages that need JavaScript."""
+    metrics = metrics or CrawlMetrics()
+    limiter = limiter or RateLimiter()
+    with metrics.span("detail.http_batch"):
+        enriched, needs_browser = fetch_job_details(jobs, fetcher=fetcher)
+    metrics.count("detail.success", len(enriched))
+    metrics.count("detail.needs_browser", len(needs_browser))
+    print(f"Enriched {len(enriched)}/{len(jobs)} jobs over HTTP.")
+    yield from enriched
+
+    if needs_browser:
+        print(f"{len(needs_browser)} job page(s) need JavaScript, falling back to Selenium.")
+        # Leased per job, so a browser crash only fails the job it happened on
+        for job in needs_browser:
+            yield enrich_with_pool(job, pool, metrics, limiter, failures)
+
+
+def snippet_text(job):
+    """What the search results show about a job: its title and teaser."""
+    return " ".join(part for part in (job.get("title"), job.get("teaser")) if part)
+
+
+def select_candidates(jobs, scores, top_k=None, threshold=None):
+    """Jobs worth a detail visit, best first: those scoring at least threshold, capped at top_k."""
+    ranked = sorted(zip(scores, range(len(jobs))), key=lambda item: -item[0])
+    if threshold is not None:
+        ranked = [(score, i) for score, i in ranked if score >= threshold]
+    if top_k is not None:
+        ranked = ranked[:top_k]
+    return [jobs[i] for _, i in ranked]
+
+
+def query_name(query):
+    return query.get("name") or f"{query.get('keywords', '')} in {query.get('location', '')} ({query.get('region', 'Australia')})"
+
+
+def iter_crawl(queries, threads=5, engine="selenium", http_concurrency=DETAIL_CONCURRENCY_PER_HOST,
+               max_pages_per_driver=25, refresh_after_hours=24, db_path=DEFAULT_DB_PATH, progress=None,
+               metrics=None, metrics_dir=DEFAULT_METRICS_DIR, page_workers=2, rate=DEFAULT_RATE,
+               screen=None, enrich_top_k=None, screen_threshold=None, parallel_queries=2, checkpoint=None):
+    """Run Seek searches over shared browsers and workers, yielding (query_names, job) as each job is ready.
+
+    ``screen`` with ``enrich_top_k``/``screen_threshold`` turns on two-stage mode; ``checkpoint`` records or resumes the run.
+    """
+    metrics = metrics or CrawlMetrics()
+    # Every page load shares one limiter, which slows down while Seek is slow or throttling
+    limiter = RateLimiter(rate)
+    # Two-stage mode holds back ads needing a detail visit until their query's listing ends, then
+    # only enriches the best-scoring snippets; the rest count as handled but aren't yielded
+    two_stage = screen is not None and (enrich_top_k is not None or screen_threshold is not None)
+    store = JobStore(db_path)
+    # Listing and detail workers borrow long-lived drivers from one pool
+    pool = DriverPool(size=max(1, threads, page_workers), max_pages=max_pages_per_driver, metrics=metrics)
+    executor = ThreadPoolExecutor(max(1, threads), thread_name_prefix="enrich")
+    # One HTTP client for every enrichment thread, so the per-host cap holds for the whole crawl
+    fetcher = DetailFetcher(http_concurrency, limiter=limiter) if engine == "http" else None
+    listing_executor = ThreadPoolExecutor(max(1, parallel_queries), thread_name_prefix="listing-crawl")
+    events = queue.Queue()
+    stop = threading.Event()
+    failures = {}  # canonical link -> why its enrichment failed
+
+    def crawl_listings(query):
+        name = query_name(query)
+        params = {key: query[key] for key in ("keywords", "location", "min_salary", "max_salary", "region") if key in query}
+        # A resumed query carries on from the page after the last one it listed
+        page, collected = positions.get(name, (1, 0))
+        listing = iter_listing_pages(pool, **params, max_jobs=query.get("max_jobs", 20) - collected, page_workers=page_workers,
+                                     metrics=metrics, limiter=limiter, start_page=page, seen=listed_links.get(name))
+        complete = False
+        try:
+            with metrics.span("listing.crawl"):
+                for page_jobs in listing:
+                    if stop.is_set():
+                        break
+                    page += 1
+                    collected += len(page_jobs)
+                    events.put(("listing", (name, page_jobs, page, collected)))
+                complete = not stop.is_set()
+        except ListingIncomplete as e:
+            print(f"{e}, stopping the listing crawl for {name}.")
+            truncated.append(name)
         except Exception as e:
-            print(f"Failed to enrich {job['title']}: {e}")
-            continue
-        
-        print("Time to enrich job ", len(enriched), ":", time.time() - enrich_start, "s")
-
-    return enriched
+            events.put(("error", e))
+        finally:
+            listing.close()
+            events.put(("listing_done", (name, complete)))
+
+    def enrich_batch(jobs):
+        if engine == "http":
+            results = {canonical_link(result["link"]): result
+                       for result in iter_enrich_http(jobs, pool, fetcher, metrics, limiter, failures) if result}
+            return [(job, results.get(canonical_link(job["link"]), {})) for job in jobs]
+        return [(job, enrich_with_pool(job, pool, metrics, limiter, failures)) for job in jobs]
+
+    def on_enriched(batch, future):
+        try:
+            results = future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            print(f"❌ Enrichment worker failed: {e}")
+            failures.update((canonical_link(job["link"]), f"worker failed: {e}") for job in batch)
+            results = [(job, {}) for job in batch]
+        events.put(("enriched", results))
+
+    def submit(jobs):
+        # The HTTP engine fetches a page's ads together; browsers take one ad per task
+        batches = [jobs] if engine == "http" else [[job] for job in jobs]
+        for batch in batches:
+            executor.submit(enrich_batch, batch).add_done_callback(partial(on_enriched, batch))
+        return len(batches)
+
+    owners = {}  # canonical link -> names of the queries that listed it
+    positions = {}  # query name -> (next page, jobs listed), for listings an earlier attempt left unfinished
+    listed_links = {}  # query name -> links it listed in an earlier attempt
+    truncated = []  # queries whose listing stopped at a page that never loaded
+    finished = {}  # canonical link -> stored job, or None if it failed or was screened out
+    held_back = defaultdict(list)  # query name -> jobs waiting for two-stage screening
+    listed = done = pending = 0
+    completed = False
+    try:
+        to_list = queries
+        if checkpoint is not None:
+            if not checkpoint.exists():
+                checkpoint.start([{**query, "name": query_name(query)} for query in queries])
+            listed_already = checkpoint.listed_queries()
+            to_list = [query for query in queries if query_name(query) not in listed_already]
+            positions = checkpoint.listing_positions()
+            # Pick up the frontier an earlier attempt at this run left behind: finished ads aren't
+            # reopened or yielded again, pending and failed ones are retried
+            retry = []
+            for link, (job, names, state) in checkpoint.frontier().items():
+                owners[link] = names
+                for name in names:
+                    listed_links.setdefault(name, set()).add(link)
+                listed += 1
+                if state in ("done", "skipped"):
+                    finished[link] = None
+                    done += 1
+                elif state == "held" and two_stage:
+                    # Screened with the query that listed it first, as in a fresh run
+                    held_back[names[0]].append(job)
+                else:
+                    retry.append(job)
+            if listed:
+                print(f"Resuming run {checkpoint.run_id}: {done} ad(s) finished, {len(retry)} to retry, "
+                      f"{len(to_list)} of {len(queries)} search(es) still to list.")
+            if retry:
+                pending += submit(retry)
+
+        for query in to_list:
+            listing_executor.submit(crawl_listings, query)
+        listings_left = len(to_list)
+        for name in set(held_back) - {query_name(query) for query in to_list}:
+            # Listed by an earlier attempt; screen what it held back
+            events.put(("listing_done", (name, False)))
+            listings_left += 1
+        while listings_left or pending:
+            kind, payload = events.get()
+            if kind == "error":
+                raise payload
+
+            settled = []  # (link, job or None), each counted once towards progress
+            repeats = []  # (name, job) for queries listing an ad that had already finished
+            reasons = {}  # link -> failure reason, for settled ads that failed
+            if kind == "listing_done":
+                name, complete = payload
+                listings_left -= 1
+                if checkpoint is not None and complete:
+                    checkpoint.listing_finished(name)
+                held = held_back.pop(name, None)
+                if not held:
+                    continue
+                with metrics.span("listing.screen"):
+                    scores = screen([snippet_text(job) for job in held])
+                selected = select_candidates(held, scores, enrich_top_k, screen_threshold)
+                print(f"Screened {len(held)} listing(s) for {name} on their snippets, enriching the best {len(selected)}.")
+                metrics.count("detail.screened_out", len(held) - len(selected))
+                if selected:
+                    pending += submit(selected)
+                    if checkpoint is not None:
+                        checkpoint.mark([job["link"] for job in selected], "pending")
+                chosen = {canonical_link(job["link"]) for job in selected}
+                settled = [(link, None) for link in (canonical_link(job["link"]) for job in held) if link not in chosen]
+            elif kind == "listing":
+                name, page_jobs, next_page, collected = payload
+                new = []
+                for job in page_jobs:
+                    link = canonical_link(job["link"])
+                    if link not in owners:
+                        owners[link] = [name]
+                        new.append(job)
+                    elif name not in owners[link]:
+                        # Another query already has this ad; don't enrich it twice
+                        owners[link].append(name)
+                        metrics.count("listing.duplicate")
+                        if checkpoint is not None:
+                            checkpoint.add_query(link, owners[link])
+                        if finished.get(link):
+                            repeats.append((name, finished[link]))
+                if new:
+                    listed += len(new)
+                    store.record_listings(new)
+                    if checkpoint is not None:
+                        checkpoint.add(new, name)
+                    # Only ads we have never enriched, or enriched too long ago, get a detail-page visit.
+                    to_enrich = store.needs_enrichment(new, refresh_after_hours)
+                    print(f"{len(new) - len(to_enrich)} job(s) already stored, {len(to_enrich)} need enriching.")
+                    metrics.count("detail.cached", len(new) - len(to_enrich))
+                    if two_stage:
+                        held_back[name].extend(to_enrich)
+                        if checkpoint is not None:
+                            checkpoint.mark([job["link"] for job in to_enrich], "held")
+                    elif to_enrich:
+                        pending += submit(to_enrich)
+                    queued = {canonical_link(job["link"]) for job in to_enrich}
+                    settled = [(job["link"], job) for job in store.get_jobs([job["link"] for job in new if canonical_link(job["link"]) not in queued])]
+                if checkpoint is not None:
+                    # Saved after the page's ads, so a resume never skips ads it hasn't recorded
+                    checkpoint.listing_progress(name, next_page, collected)
+            else:
+                pending -= 1
+                for job, result in payload:
+                    link = canonical_link(job["link"])
+                    if result:
+                        store.save_enriched([result])
+                        settled.extend((link, stored) for stored in store.get_jobs([link]))
+                    else:
+                        settled.append((link, None))
+                        reasons[link] = failures.pop(link, "no details returned")
+
+            for name, job in repeats:
+                yield [name], job
+            for link, job in settled:
+                finished[link] = job
+                done += 1
+                if checkpoint is not None:
+                    # Saved before the job is handed on, so a crash downstream can't lose it
+                    if job:
+                        checkpoint.mark([link], "done")
+                    elif link in reasons:
+                        checkpoint.mark([link], "failed", reasons[link])
+                    else:
+                        checkpoint.mark([link], "skipped")
+                if progress:
+                    # Distinct ads, failures included; the total grows as pages arrive
+                    progress(done, listed)
+                if job:
+                    yield list(owners[link]), job
+        completed = True
+    finally:
+        stop.set()
+        listing_executor.shutdown(wait=True, cancel_futures=True)
+        executor.shutdown(wait=True, cancel_futures=True)
+        if fetcher is not None:
+            fetcher.close()
+        pool.close()
+        store.close()
+        if checkpoint is not None:
+            # A listing that stopped at a failed page leaves the run to be resumed, like an interruption
+            status = "interrupted" if not completed else "incomplete" if truncated else "complete"
+            checkpoint.finish(status)
+            counts = checkpoint.counts()
+            print(f"Run {checkpoint.run_id} {status}: " + ", ".join(f"{state}={count}" for state, count in sorted(counts.items())))
+            if truncated:
+                print(f"Listing stopped early for {', '.join(truncated)}; --resume {checkpoint.run_id} lists the missing pages.")
+        print(format_summary(metrics.write(metrics_dir)))
+        print(f"Request rate settled at {limiter.rate:.2f}/s.")
+
+
+def iter_enriched_jobs(keywords="", location="", min_salary=None, max_salary=None, region="Australia", max_jobs=20,
+                       **options):
+    """Run one Seek search and yield enriched jobs as soon as each one is ready; see iter_crawl for options."""
+    query = {"keywords": keywords, "location": location, "min_salary": min_salary, "max_salary": max_salary,
+             "region": region, "max_jobs": max_jobs}
+    for _, job in iter_crawl([query], **options):
+        yield job
+
+
+def crawl_batch(queries, **options):
+    """Run many searches over shared workers; returns {query name: [jobs]} with each ad enriched once."""
+    results = {query_name(query): [] for query in queries}
+    for names, job in iter_crawl(queries, **options):
+        for name in names:
+            results[name].append(job)
+    return results
+
+
+def load_query_specs(path):
+    """Read saved searches from a JSON list or a JSON-lines file of query dicts."""
+    text = Path(path).read_text(encoding="utf-8")
+    queries = json.loads(text) if text.lstrip().startswith("[") else [json.loads(line) for line in text.splitlines() if line.strip()]
+    names = [query_name(query) for query in queries]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Query names must be unique: {sorted(duplicates)}")
+    return queries
 
 
 if __name__ == "__main__":
@@ -214,43 +638,90 @@ if __name__ == "__main__":
     parser.add_argument("--min_salary", type=int, default=100000)
     parser.add_argument("--max_salary", type=int, default=None)
     parser.add_argument("--threads", type=int, default=5)
+    parser.add_argument("--page_workers", type=int, default=2, help="Search-results pages fetched at once")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Initial page loads per second across all workers")
+    parser.add_argument("--enrich_top_k", type=int, default=None, help="Only enrich the K listings whose title and teaser best match --resume_file")
+    parser.add_argument("--screen_threshold", type=float, default=None, help="Only enrich listings whose snippet scores at least this cosine similarity")
+    parser.add_argument("--resume_file", type=str, default=None, help="Resume (.txt) to screen listings against")
     parser.add_argument("--region", type=str, default="Australia", choices=["Australia", "New Zealand"])
     parser.add_argument("--max_jobs", type=int, default=20)
+    parser.add_argument("--max_pages_per_driver", type=int, default=25)
+    parser.add_argument("--engine", type=str, default="selenium", choices=["selenium", "http"])
+    parser.add_argument("--http_concurrency", type=int, default=DETAIL_CONCURRENCY_PER_HOST)
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB_PATH))
+    parser.add_argument("--refresh_after_hours", type=float, default=24)
+    parser.add_argument("--metrics_dir", type=str, default=str(DEFAULT_METRICS_DIR))
+    parser.add_argument("--queries", type=str, default=None,
+                        help="JSON or JSON-lines file of saved searches to crawl together instead of --keywords/--location")
+    parser.add_argument("--parallel_queries", type=int, default=2, help="Saved searches whose listings are crawled at once")
+    parser.add_argument("--resume", type=str, default=None, metavar="RUN_ID",
+                        help="Continue an interrupted crawl, retrying only its unfinished and failed ads")
 
 
 
     args = parser.parse_args()
 
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920x1080")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-
-    try:
-        jobs = fetch_jobs(driver, max_jobs=args.max_jobs)
-
-        if jobs:
-            if args.threads<=1:
-                enriched = enrich_jobs(driver, jobs)
-            else:
-                enriched = enrich_jobs_parallel(jobs, args.threads)
-                
-            data_path = Path(__file__).resolve().parent.parent / "data" / "seek_jobs_enriched.json"
-            data_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(data_path, "w", encoding="utf-8") as f:
-                json.dump(enriched, f, indent=2)
-
-            print(f"\nEnriched and saved {len(enriched)} jobs to {data_path}")
+    screen = None
+    if args.enrich_top_k is not None or args.screen_threshold is not None:
+        if not args.resume_file:
+            parser.error("--enrich_top_k and --screen_threshold need --resume_file")
+        from encoders import MODEL_NAME, cosine_scores, get_document_encoder, get_sentence_model
+
+        resume_embedding = get_document_encoder(MODEL_NAME).encode(Path(args.resume_file).read_text(encoding="utf-8"))
+        screen = lambda texts: cosine_scores(resume_embedding, get_sentence_model(MODEL_NAME).encode(texts))
+
+    options = dict(
+        threads=args.threads,
+        page_workers=args.page_workers,
+        rate=args.rate,
+        screen=screen,
+        enrich_top_k=args.enrich_top_k,
+        screen_threshold=args.screen_threshold,
+        engine=args.engine,
+        http_concurrency=args.http_concurrency,
+        max_pages_per_driver=args.max_pages_per_driver,
+        refresh_after_hours=args.refresh_after_hours,
+        db_path=args.db,
+        metrics_dir=args.metrics_dir,
+    )
+    data_dir = Path(__file__).resolve().parent.parent / "data"
+
+    # Jobs are written out one line at a time as they are enriched rather than held until the end
+    checkpoint = CrawlCheckpoint(args.resume, args.db)
+    if args.resume:
+        try:
+            meta = checkpoint.meta()
+        except KeyError as e:
+            parser.error(str(e))
+        queries = checkpoint.queries()
+        data_path = Path(meta["output"])
+        batch_mode = meta["batch"]
+    else:
+        if args.queries:
+            queries = load_query_specs(args.queries)
+            data_path = data_dir / "seek_jobs_batch.jsonl"
         else:
-            print("No jobs collected to enrich.")
-    finally:
-        driver.quit() 
-        
-    print("Total runtime:", time.time() - start, "s")
+            queries = [{"keywords": args.keywords, "location": args.location, "min_salary": args.min_salary,
+                        "max_salary": args.max_salary, "region": args.region, "max_jobs": args.max_jobs}]
+            data_path = data_dir / "seek_jobs_enriched.jsonl"
+        batch_mode = bool(args.queries)
+        queries = [{**query, "name": query_name(query)} for query in queries]
+        checkpoint.start(queries, {"output": str(data_path), "batch": batch_mode})
+    print(f"Run ID: {checkpoint.run_id} (continue it with --resume {checkpoint.run_id} if it stops early)")
+
+    per_query = {query["name"]: 0 for query in queries}
+    # A resumed run adds to the output of its earlier attempts
+    with checkpoint, JsonlWriter(data_path, append=bool(args.resume)) as writer:
+        for names, job in iter_crawl(queries, parallel_queries=args.parallel_queries, checkpoint=checkpoint, **options):
+            writer.write({**job, "queries": names} if batch_mode else job)
+            for name in names:
+                per_query[name] += 1
+        failed = checkpoint.failures()
+
+    if batch_mode:
+        for name, count in per_query.items():
+            print(f"{name}: {count} job(s)")
+    for link, reason, attempts in failed:
+        print(f"❌ {link} failed after {attempts} attempt(s): {reason}")
+    print(f"\nSaved {writer.count} jobs to {args.db} and {data_path}")
+    print(f"Metrics written to {args.metrics_dir}")
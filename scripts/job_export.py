@@ -0,0 +1,185 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from job_store import JobStore, DEFAULT_DB_PATH
+from vector_index import DEFAULT_INDEX_DIR, JobVectorIndex
+
+# Optional columnar export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+DEFAULT_EXPORT_PATH = Path(__file__).resolve().parent.parent / "data" / "jobs.parquet"
+TEXT_COLUMNS = ("link", "title", "company", "location", "date_posted", "salary", "teaser", "description", "content_hash")
+TIME_COLUMNS = ("first_seen", "last_seen")
+EXPORT_BATCH_SIZE = 1000
+
+
+class JsonlWriter:
+    """Append-only JSON-lines file of jobs.
+
+    Each job is flushed as soon as it is written, so memory stays flat and an
+    interrupted crawl keeps everything written before it stopped. With
+    ``append=False`` an existing file is started afresh.
+    """
+
+    def __init__(self, path, append=True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, job):
+        self._file.write(json.dumps(job, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+def iter_jsonl(path):
+    """Yield jobs from a JSON-lines file one at a time; a line cut short by a crash is skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable line {number} of {path}.")
+
+
+def sort_jsonl(source, dest, key, reverse=False):
+    """Write the jobs in ``source`` to ``dest`` ordered by ``key(job)``.
+
+    Only each line's sort key and byte offset are held in memory; the lines
+    themselves are copied across one at a time. Returns the number of jobs.
+    """
+    keys = []
+    offset = 0
+    with open(source, "rb") as f:
+        for line in f:
+            if line.strip():
+                keys.append((key(json.loads(line)), offset))
+            offset += len(line)
+    keys.sort(key=lambda item: item[0], reverse=reverse)
+
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with open(source, "rb") as f, open(dest, "wb") as out:
+        for _, offset in keys:
+            f.seek(offset)
+            out.write(f.readline())
+    return len(keys)
+
+
+def _schema(dim):
+    return pa.schema(
+        [pa.field(column, pa.string()) for column in TEXT_COLUMNS]
+        + [pa.field(column, pa.float64()) for column in TIME_COLUMNS]
+        + [pa.field("embedding", pa.list_(pa.float32(), dim))]
+    )
+
+
+def _record_batch(jobs, index, schema, dim):
+    columns = [pa.array([None if job.get(column) is None else str(job[column]) for job in jobs], pa.string()) for column in TEXT_COLUMNS]
+    columns += [pa.array([job.get(column) for job in jobs], pa.float64()) for column in TIME_COLUMNS]
+
+    vectors = np.zeros((len(jobs), dim), dtype=np.float32)
+    indexed = np.array([index is not None and job["link"] in index.hashes for job in jobs], dtype=bool)
+    if indexed.any():
+        vectors[indexed] = index.get_vectors([job["link"] for job, found in zip(jobs, indexed) if found])
+    embeddings = pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), dim, mask=pa.array(~indexed))
+    return pa.RecordBatch.from_arrays(columns + [embeddings], schema=schema)
+
+
+def export_jobs(jobs, path=DEFAULT_EXPORT_PATH, index=None, dim=None, batch_size=EXPORT_BATCH_SIZE):
+    """Write jobs and their embeddings to Parquet (``.parquet``) or an Arrow IPC file (``.arrow``).
+
+    ``jobs`` may be any iterable, e.g. ``JobStore.iter_jobs()``. It is written
+    ``batch_size`` rows at a time, so peak memory does not grow with the corpus.
+    Embeddings come from ``index`` (a JobVectorIndex); jobs it has not indexed
+    get a null embedding. Returns the number of rows written.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet/Arrow export: pip install pyarrow")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dim = dim or (index.dim if index is not None else 1)
+    schema = _schema(dim)
+    if path.suffix == ".arrow":
+        writer = pa.ipc.new_file(str(path), schema)
+    else:
+        writer = pq.ParquetWriter(str(path), schema)
+
+    rows = 0
+    batch = []
+    try:
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                writer.write_batch(_record_batch(batch, index, schema, dim))
+                rows += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(batch, index, schema, dim))
+            rows += len(batch)
+    finally:
+        writer.close()
+    return rows
+
+
+def read_jobs_table(path=DEFAULT_EXPORT_PATH, columns=None):
+    """Load an export as a pyarrow Table, memory-mapped and limited to ``columns`` when given."""
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read Parquet/Arrow exports: pip install pyarrow")
+    path = Path(path)
+    if path.suffix == ".arrow":
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+        return table.select(columns) if columns else table
+    return pq.read_table(str(path), columns=columns, memory_map=True)
+
+
+def embedding_matrix(table):
+    """The embedding column as an (n, dim) float32 matrix; rows without an embedding are zeros."""
+    column = table.column("embedding").combine_chunks()
+    dim = column.type.list_size
+    matrix = column.values.to_numpy(zero_copy_only=False).reshape(-1, dim)
+    if column.null_count:
+        # Parquet doesn't store values behind a null list; Arrow files store zeros
+        matrix = matrix.copy()
+        matrix[column.is_null().to_numpy(zero_copy_only=False)] = 0
+    return matrix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored jobs and their embeddings to Parquet or Arrow.")
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB_PATH))
+    parser.add_argument("--output", type=str, default=str(DEFAULT_EXPORT_PATH), help="A .parquet or .arrow file")
+    parser.add_argument("--index_dir", type=str, default=str(DEFAULT_INDEX_DIR))
+    parser.add_argument("--no_embeddings", action="store_true", help="Export the job table only")
+    parser.add_argument("--batch_size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    index = None
+    meta_path = Path(args.index_dir) / "meta.json"
+    if not args.no_embeddings and meta_path.exists():
+        # The index's own metadata gives the dimension, so no model needs loading
+        index = JobVectorIndex(json.loads(meta_path.read_text(encoding="utf-8"))["dim"], args.index_dir)
+
+    with JobStore(args.db) as store:
+        rows = export_jobs(store.iter_jobs(), args.output, index=index, batch_size=args.batch_size)
+    print(f"Exported {rows} jobs to {args.output}")
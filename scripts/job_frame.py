@@ -0,0 +1,88 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+HOURS_PER_YEAR = 38 * 52
+DAYS_PER_YEAR = 5 * 52
+# A pay period stated right after an amount: "$50 per hour", "$800/day", "$45 p.h.", "$2000 weekly"
+PAY_PERIOD = re.compile(r"\d\s*(?:per\s+|/\s*|an?\s+|p\.?\s*)(hour|hr|h|day|d|week|wk|w|month|mth|m)\b|\d\s*(hourly|daily|weekly|monthly)")
+PERIODS_PER_YEAR = {"h": HOURS_PER_YEAR, "d": DAYS_PER_YEAR, "w": 52, "m": 12}
+# Numbers that aren't pay: super rates ("11.5% super") and durations ("12 month contract")
+NOT_PAY = re.compile(r"\d+(?:\.\d+)?\s*%|\d+\s*-?\s*(?:months?|mths?|years?|yrs?|weeks?|wks?|days?|hours?|hrs?)\b")
+AGE_UNITS_IN_DAYS = {"m": 1 / 1440, "h": 1 / 24, "d": 1, "w": 7, "mo": 30}
+
+
+def parse_salary(text):
+    """Return (min, max) annual salary from Seek's free-text salary label, or (nan, nan)."""
+    if not text or not isinstance(text, str):
+        return np.nan, np.nan
+    lowered = NOT_PAY.sub(" ", text.lower().replace(",", ""))
+    amounts = []
+    for number, thousands in re.findall(r"\$?\s*(\d+(?:\.\d+)?)\s*(k)?\b", lowered):
+        amounts.append((float(number) * 1000, True) if thousands else (float(number), False))
+    if not amounts:
+        return np.nan, np.nan
+
+    # Amounts written in thousands are already annual
+    period = PAY_PERIOD.search(lowered)
+    periods = PERIODS_PER_YEAR[(period.group(1) or period.group(2))[0]] if period else 1
+    amounts = [value if thousands else value * periods for value, thousands in amounts]
+
+    # Drop stray small numbers that are too low to be a salary
+    amounts = [value for value in amounts if value >= 1000]
+    if not amounts:
+        return np.nan, np.nan
+    return min(amounts[:2]), max(amounts[:2])
+
+
+def parse_age_days(dates):
+    """Vectorised parse of labels like "Posted 3d ago" or "Listed 5 hours ago" into days."""
+    parts = dates.fillna("").str.lower().str.extract(r"(\d+)\s*(mo|m|h|d|w)")
+    units = parts[1].map(AGE_UNITS_IN_DAYS)
+    return pd.to_numeric(parts[0], errors="coerce") * units
+
+
+def build_job_frame(jobs):
+    """Columnar view of a job list; row i of the frame is jobs[i]."""
+    frame = pd.DataFrame({
+        # Stored jobs can carry None for fields the ad didn't have
+        "title": [job.get("title") or "" for job in jobs],
+        "company": [job.get("company") or "" for job in jobs],
+        "location": [job.get("location") or "" for job in jobs],
+        "date_posted": [job.get("date_posted") or "" for job in jobs],
+        "salary": [job.get("salary") or "" for job in jobs],
+        "description": [job.get("description") or "" for job in jobs],
+    })
+    frame["search_text"] = (frame["title"] + " " + frame["description"]).str.lower()
+    frame["location_norm"] = frame["location"].fillna("").str.lower().str.strip()
+    frame["age_days"] = parse_age_days(frame["date_posted"])
+    salaries = [parse_salary(text) for text in frame["salary"]]
+    frame["salary_min"] = np.array([low for low, _ in salaries], dtype=np.float64)
+    frame["salary_max"] = np.array([high for _, high in salaries], dtype=np.float64)
+    frame["match_score"] = np.zeros(len(frame), dtype=np.float32)
+    return frame
+
+
+def filter_mask(frame, min_score=0.0, keyword="", location="", salary_range=None, max_age_days=None,
+                include_unknown=True):
+    """Boolean mask over the frame; scores are fractions (0-1), salary_range is annual (low, high)."""
+    mask = frame["match_score"].to_numpy() >= min_score
+    if keyword:
+        mask &= frame["search_text"].str.contains(keyword.lower(), regex=False).to_numpy()
+    if location:
+        mask &= frame["location_norm"].str.contains(location.lower().strip(), regex=False).to_numpy()
+    if salary_range is not None:
+        low, high = salary_range
+        salary_min = frame["salary_min"].to_numpy()
+        salary_max = frame["salary_max"].to_numpy()
+        known = ~np.isnan(salary_min)
+        # Overlapping bands pass, so "$120k-$140k" matches a 130k-200k filter
+        in_range = known & (salary_max >= low) & (salary_min <= high)
+        mask &= in_range | (~known & include_unknown)
+    if max_age_days is not None:
+        age = frame["age_days"].to_numpy()
+        known = ~np.isnan(age)
+        mask &= (known & (age <= max_age_days)) | (~known & include_unknown)
+    return mask
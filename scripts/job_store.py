@@ -0,0 +1,159 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "jobs.db"
+ENRICHED_FIELDS = ("description", "company", "location", "date_posted", "salary")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    link TEXT PRIMARY KEY,
+    listing TEXT NOT NULL,
+    enriched TEXT,
+    content_hash TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    enriched_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+"""
+
+
+def canonical_link(link):
+    """Seek ad links carry tracking query strings and fragments; the path identifies the ad."""
+    parts = urlsplit(link)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+def content_hash(job):
+    payload = json.dumps({field: job.get(field, "") for field in ENRICHED_FIELDS}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """SQLite store of Seek jobs keyed by canonical ad link.
+
+    Listing data is refreshed on every sighting; enriched fields are only
+    replaced when an ad is enriched again.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record_listings(self, jobs, seen_at=None):
+        seen_at = seen_at or time.time()
+        rows = [(canonical_link(job["link"]), json.dumps(job), seen_at, seen_at) for job in jobs if job.get("link")]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO jobs (link, listing, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET listing = excluded.listing, last_seen = excluded.last_seen
+                """,
+                rows,
+            )
+
+    def needs_enrichment(self, jobs, max_age_hours=24):
+        """Return the jobs that were never enriched or whose enrichment is older than max_age_hours."""
+        links = [canonical_link(job["link"]) for job in jobs if job.get("link")]
+        cutoff = time.time() - max_age_hours * 3600
+        fresh = set()
+        with self._lock:
+            for chunk in _chunks(links, 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT link FROM jobs WHERE enriched_at >= ? AND link IN ({placeholders})",
+                    [cutoff, *chunk],
+                )
+                fresh.update(row["link"] for row in rows)
+        return [job for job in jobs if job.get("link") and canonical_link(job["link"]) not in fresh]
+
+    def save_enriched(self, jobs, enriched_at=None):
+        enriched_at = enriched_at or time.time()
+        rows = []
+        for job in jobs:
+            if not job.get("link"):
+                continue
+            enriched = {field: job.get(field) for field in ENRICHED_FIELDS if field in job}
+            rows.append((canonical_link(job["link"]), json.dumps(job), json.dumps(enriched), content_hash(job), enriched_at, enriched_at, enriched_at))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO jobs (link, listing, enriched, content_hash, first_seen, last_seen, enriched_at) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET enriched = excluded.enriched, content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen, enriched_at = excluded.enriched_at
+                """,
+                rows,
+            )
+
+    def get_jobs(self, links):
+        """Return enriched jobs for the given links, in the same order, skipping unknown or unenriched ones."""
+        wanted = [canonical_link(link) for link in links]
+        found = {}
+        with self._lock:
+            for chunk in _chunks(wanted, 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT * FROM jobs WHERE enriched IS NOT NULL AND link IN ({placeholders})", chunk)
+                found.update((row["link"], _row_to_job(row)) for row in rows)
+        return [found[link] for link in wanted if link in found]
+
+    def content_hashes(self):
+        """Map of link to content hash for every enriched job, without loading the job bodies."""
+        with self._lock:
+            rows = self._conn.execute("SELECT link, content_hash FROM jobs WHERE enriched IS NOT NULL").fetchall()
+        return {row["link"]: row["content_hash"] for row in rows}
+
+    def iter_jobs(self, batch_size=500):
+        """Yield every enriched job in insertion order, reading batch_size rows at a time."""
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, * FROM jobs WHERE enriched IS NOT NULL AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1]["rowid"]
+            for row in rows:
+                yield _row_to_job(row)
+
+    def all_jobs(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE enriched IS NOT NULL ORDER BY last_seen DESC").fetchall()
+        return [_row_to_job(row) for row in rows]
+
+
+def _row_to_job(row):
+    job = json.loads(row["listing"])
+    job.update(json.loads(row["enriched"]))
+    job["link"] = row["link"]
+    job["content_hash"] = row["content_hash"]
+    job["first_seen"] = row["first_seen"]
+    job["last_seen"] = row["last_seen"]
+    return job
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
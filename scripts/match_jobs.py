@@ -1,37 +1,52 @@
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
-import json
+from itertools import islice
+from pathlib import Path
+import heapq
 
-# Load enriched job listings
-with open("../data/seek_jobs_enriched.json", "r", encoding="utf-8") as f:
-    jobs = json.load(f)
+from embedding_cache import EmbeddingCache, encode_with_cache
+from encoders import MODEL_NAME, get_document_encoder
+from job_export import JsonlWriter, iter_jsonl, sort_jsonl
+
+CHUNK_SIZE = 256
+TOP_N = 10
+RANKED_PATH = Path("../data/seek_jobs_ranked.jsonl")
 
 # Load your resume as plain text (you can paste it into a .txt file)
 with open("../data/resume.txt", "r", encoding="utf-8") as f:
     resume_text = f.read()
 
 # Load model (this is free + local)
-model = SentenceTransformer("all-MiniLM-L6-v2")
+# Long ads are encoded as chunks and pooled instead of being truncated
+model = get_document_encoder(MODEL_NAME)
+cache = EmbeddingCache(model.name, model.get_sentence_embedding_dimension())
 
-# Encode resume and each job description
+# Encode resume, then read the enriched jobs a chunk at a time, only encoding
+# descriptions the cache hasn't seen. Scored jobs go straight to disk; only
+# the best TOP_N are kept in memory (a min-heap, so the weakest is dropped first)
 resume_embedding = model.encode(resume_text)
-job_embeddings = [model.encode(job["description"]) for job in jobs]
-
-# Compute similarity scores
-scores = cosine_similarity([resume_embedding], job_embeddings)[0]
-
-# Attach scores to jobs
-for job, score in zip(jobs, scores):
-    job["match_score"] = round(float(score), 4)  # easier to read
-
-# Sort jobs by best match
-jobs_sorted = sorted(jobs, key=lambda x: x["match_score"], reverse=True)
+top_matches = []
+scored_path = RANKED_PATH.with_suffix(".unsorted.jsonl")
+job_lines = iter_jsonl("../data/seek_jobs_enriched.jsonl")
+with JsonlWriter(scored_path, append=False) as writer:
+    while chunk := list(islice(job_lines, CHUNK_SIZE)):
+        job_embeddings = encode_with_cache(model, [job["description"] for job in chunk], cache)
+        scores = cosine_similarity([resume_embedding], job_embeddings)[0]
+        for job, score in zip(chunk, scores):
+            job["match_score"] = round(float(score), 4)  # easier to read
+            writer.write(job)
+            # Ties keep the earlier job, as a stable sort would
+            entry = (job["match_score"], -writer.count, job)
+            if len(top_matches) < TOP_N:
+                heapq.heappush(top_matches, entry)
+            else:
+                heapq.heappushpop(top_matches, entry)
+print(f"Embedding cache: {cache.stats()}")
 
 # Output top 10
 print("\n📊 Top Matching Jobs:\n")
-for job in jobs_sorted[:10]:
-    print(f"{job['match_score']*100:.1f}% match — {job['title']} at {job.get('company', 'N/A')}")
+for score, _, job in sorted(top_matches, key=lambda entry: entry[:2], reverse=True):
+    print(f"{score*100:.1f}% match — {job['title']} at {job.get('company', 'N/A')}")
 
-# Save results
-with open("../data/seek_jobs_ranked.json", "w", encoding="utf-8") as f:
-    json.dump(jobs_sorted, f, indent=2)
+# Save results, sorted by best match in a second pass over the scored file
+sort_jsonl(scored_path, RANKED_PATH, key=lambda job: job["match_score"], reverse=True)
+scored_path.unlink()
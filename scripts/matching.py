@@ -0,0 +1,131 @@
+import re
+
+import numpy as np
+
+from encoders import get_keybert
+
+
+STOPWORDS = {
+    "various", "several", "role", "team", "position", "skills", "work",
+    "ability", "knowledge", "experience", "others", "requirements"
+}
+
+
+def flatten_keywords(phrases):
+    words = set()
+    for phrase in phrases:
+        for word in phrase.lower().split():
+            words.add(word.strip())
+    return sorted(words)
+
+
+def is_valid_phrase(kw: str) -> bool:
+    kw = kw.strip().lower()
+
+    # Ignore empty or purely numeric
+    if not kw or kw.isnumeric():
+        return False
+
+    # Ignore phrases with only stopwords or filler terms
+    WEAK_WORDS = {"skills", "experience", "expertise", "proficient", "ability", "various", "strong", "knowledge", "understanding", "working", "role", "team"}
+    tokens = kw.split()
+    if all(tok in WEAK_WORDS for tok in tokens):
+        return False
+
+    # Too short (e.g., "bi", "ai", unless useful — tweak min length as needed)
+    if len(kw) < 3:
+        return False
+
+    # Ignore phrases with weak structure like "adjective noun"
+    # e.g., "proficient sql", "strong cloud"
+    if len(tokens) == 2 and re.match(r"^(proficient|strong|expertise|solid)$", tokens[0]):
+        return False
+
+    # Optional: Keep only noun-based phrases (could plug in spaCy here)
+
+    return True
+
+
+def _clean_skills(raw_keywords):
+    seen = set()
+    cleaned = set()
+
+    for kw, _ in raw_keywords:
+        kw_clean = kw.lower().strip()
+        if kw_clean in STOPWORDS:
+            continue
+        if not any(kw_clean in s or s in kw_clean for s in seen):
+            cleaned.add(kw_clean)
+            seen.add(kw_clean)
+
+    return cleaned
+
+
+def extract_skills(text):
+    return extract_skills_batch([text])[0]
+
+
+def extract_skills_batch(texts, doc_embeddings=None):
+    """Run KeyBERT once over all texts.
+
+    Pass the embeddings already computed for scoring as doc_embeddings so the
+    descriptions are not encoded a second time.
+    """
+    if not texts:
+        return []
+    raw_keywords = get_keybert().extract_keywords(
+        list(texts),
+        keyphrase_ngram_range=(1, 2),
+        stop_words="english",
+        top_n=15,
+        doc_embeddings=None if doc_embeddings is None else np.asarray(doc_embeddings),
+    )
+    # KeyBERT unwraps the result when it is given a single document
+    if len(texts) == 1:
+        raw_keywords = [raw_keywords]
+    return [_clean_skills(keywords) for keywords in raw_keywords]
+
+
+def extract_resume_keywords(text, top_n=20):
+    raw_keywords = get_keybert().extract_keywords(
+        text,
+        keyphrase_ngram_range=(1, 2),
+        stop_words="english",
+        top_n=top_n,
+    )
+
+    seen = set()
+    cleaned = []
+
+    for kw, _ in raw_keywords:
+        kw_clean = kw.lower().strip()
+
+        if not is_valid_phrase(kw_clean):
+            continue
+
+        # Deduplicate loosely
+        if not any(kw_clean in s or s in kw_clean for s in seen):
+            cleaned.append(kw_clean)
+            seen.add(kw_clean)
+
+    return cleaned
+
+
+def build_cover_letter(job, resume_keywords, matched_skills, missing_skills):
+    company = job.get("company", "the company")
+    title = job.get("title", "this role")
+    location = job.get("location", "your location")
+    top_keywords = ", ".join(list(resume_keywords)[:6]) if resume_keywords else "relevant experience"
+    matched = ", ".join(matched_skills[:6]) if matched_skills else "key requirements"
+    missing = ", ".join(missing_skills[:4]) if missing_skills else "no major gaps"
+    return (
+        f"Dear Hiring Manager,\n\n"
+        f"I am writing to apply for the {title} position at {company} in {location}. "
+        f"My background includes {top_keywords}, and I have hands-on experience with {matched}. "
+        f"I’m excited by the role and confident I can contribute quickly.\n\n"
+        f"From your job description, I see a focus on {matched}. "
+        f"If selected, I can strengthen areas like {missing} through focused learning and collaboration.\n\n"
+        f"Thank you for your time and consideration. I’d welcome the chance to discuss how I can help.\n\n"
+        f"Sincerely,\n"
+        f"[Your Name]\n"
+    )
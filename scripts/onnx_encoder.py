@@ -0,0 +1,133 @@
+# scripts/onnx_encoder.py
+#
+# Int8-quantised ONNX export of the sentence encoder for CPU-only deployments.
+# Select it with ENCODER_BACKEND=onnx; export ahead of time with
+#   python scripts/onnx_encoder.py --export
+
+import argparse
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+
+# Optional ONNX runtime backend
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+
+DEFAULT_ONNX_DIR = Path(__file__).resolve().parent.parent / "data" / "onnx"
+
+# Mean cosine distance to the PyTorch embeddings that bench_onnx.py accepts.
+# Scores are cosine similarities, so a distance of 0.02 moves a match score by
+# roughly two percentage points at most for typical resume/job pairs.
+EMBEDDING_TOLERANCE = 0.02
+
+
+def onnx_model_dir(model_name, onnx_dir=DEFAULT_ONNX_DIR):
+    return Path(onnx_dir) / model_name.replace("/", "_")
+
+
+def export_quantized(model_name, onnx_dir=DEFAULT_ONNX_DIR, max_seq_length=256):
+    """Export the transformer behind a SentenceTransformer to ONNX and quantise its weights to int8."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    out_dir = onnx_model_dir(model_name, onnx_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)[0]
+
+    dummy = st_model.tokenizer(["export example"], return_tensors="pt")
+    fp32_path = out_dir / "model.onnx"
+    torch.onnx.export(
+        LastHiddenState(transformer),
+        (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+        str(fp32_path),
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={name: {0: "batch", 1: "sequence"} for name in ("input_ids", "attention_mask", "token_type_ids", "last_hidden_state")},
+        opset_version=14,
+    )
+    quantize_dynamic(str(fp32_path), str(out_dir / "model-int8.onnx"), weight_type=QuantType.QInt8)
+    st_model.tokenizer.save_pretrained(str(out_dir))
+    (out_dir / "max_seq_length.txt").write_text(str(st_model.get_max_seq_length() or max_seq_length))
+    print(f"Exported int8 ONNX model to {out_dir}")
+    return out_dir
+
+
+class OnnxSentenceEncoder:
+    """Drop-in for the parts of SentenceTransformer the app uses, running an int8 ONNX graph.
+
+    Reproduces all-MiniLM-L6-v2's pipeline: mean pooling over the attention
+    mask followed by L2 normalisation.
+    """
+
+    def __init__(self, model_name, onnx_dir=DEFAULT_ONNX_DIR, threads=None):
+        if ort is None:
+            raise RuntimeError("ENCODER_BACKEND=onnx needs onnxruntime: pip install onnxruntime")
+        from transformers import AutoTokenizer
+
+        model_dir = onnx_model_dir(model_name, onnx_dir)
+        if not (model_dir / "model-int8.onnx").exists():
+            if importlib.util.find_spec("torch") is None:
+                raise RuntimeError(
+                    f"No exported ONNX model in {model_dir} and torch isn't installed to export one: run "
+                    "`python scripts/onnx_encoder.py --export` on a host with torch and copy that directory here"
+                )
+            export_quantized(model_name, onnx_dir)
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(model_dir / "model-int8.onnx"), options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.max_seq_length = int((model_dir / "max_seq_length.txt").read_text())
+        self._input_names = {item.name for item in self.session.get_inputs()}
+        self._dim = self.session.get_outputs()[0].shape[-1]
+
+    def get_max_seq_length(self):
+        return self.max_seq_length
+
+    def get_sentence_embedding_dimension(self):
+        return self._dim
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        output = np.empty((len(sentences), self._dim), dtype=np.float32)
+
+        # Same trick as SentenceTransformer: batch similar lengths together
+        order = np.argsort([-len(text) for text in sentences], kind="stable")
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = self.tokenizer(
+                [sentences[i] for i in batch], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np",
+            )
+            feed = {name: inputs[name].astype(np.int64) for name in self._input_names}
+            hidden = self.session.run(None, feed)[0]
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            output[batch] = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return output[0] if single else output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", type=str, default="all-MiniLM-L6-v2")
+    parser.add_argument("--export", action="store_true", help="Export and quantise the model, then exit")
+    args = parser.parse_args()
+
+    if args.export:
+        export_quantized(args.model)
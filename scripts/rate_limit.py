@@ -0,0 +1,62 @@
+import asyncio
+import random
+import threading
+import time
+
+
+DEFAULT_RATE = 2.0
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """Exponential backoff with full jitter for the given 1-based retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class RateLimiter:
+    """Token bucket shared by every crawl worker, thread and coroutine alike.
+
+    The rate adapts AIMD-style: each normal response nudges it up by
+    ``increase`` requests/second, while a throttled response (HTTP 429/503,
+    a block page, a timeout) or one slower than ``slow_seconds`` halves it.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=4, min_rate=0.2, max_rate=None, increase=0.1, slow_seconds=8.0):
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.increase = increase
+        self.slow_seconds = slow_seconds
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token, going into debt if none is left; return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, seconds=None, throttled=False):
+        """Feed back how a request went; returns True if the rate was cut."""
+        with self._lock:
+            if throttled or (seconds is not None and seconds > self.slow_seconds):
+                self.rate = max(self.min_rate, self.rate / 2)
+                return True
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            return False
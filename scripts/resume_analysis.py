@@ -0,0 +1,45 @@
+import hashlib
+import io
+
+from matching import extract_resume_keywords, flatten_keywords
+
+# Optional for DOCX support
+try:
+    import docx2txt
+except ImportError:
+    docx2txt = None
+
+
+class ResumeAnalysis:
+    """Everything matching needs from one resume file, computed once per file content.
+
+    ``keyphrases`` are the cleaned KeyBERT phrases and ``keywords`` the
+    sorted words they contain.
+    """
+
+    def __init__(self, content_hash, text, keyphrases, keywords, embedding):
+        self.content_hash = content_hash
+        self.text = text
+        self.keyphrases = keyphrases
+        self.keywords = keywords
+        self.embedding = embedding
+
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_resume(name, data):
+    """Text of an uploaded .txt or .docx resume, given its file name and bytes."""
+    if name.endswith(".txt"):
+        return data.decode("utf-8")
+    if name.endswith(".docx") and docx2txt:
+        return docx2txt.process(io.BytesIO(data))
+    raise ValueError("Unsupported file type or missing docx2txt.")
+
+
+def analyse_resume(name, data, encoder):
+    """Parse the file, extract its keyphrases and embed it with ``encoder``."""
+    text = read_resume(name, data)
+    keyphrases = tuple(extract_resume_keywords(text))
+    return ResumeAnalysis(file_hash(data), text, keyphrases, flatten_keywords(keyphrases), encoder.encode(text))
@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from job_store import canonical_link
+
+# Optional approximate-nearest-neighbour backend
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent.parent / "data" / "vector_index"
+
+
+def _normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class JobVectorIndex:
+    """Cosine-similarity index over job embeddings, keyed by canonical job link.
+
+    Normalised float32 vectors are always kept (and saved) so results can be
+    re-scored exactly. With hnswlib installed an HNSW graph answers queries;
+    otherwise a blocked NumPy scan does, which stays in the low milliseconds
+    for tens of thousands of jobs.
+    """
+
+    def __init__(self, dim, path=DEFAULT_INDEX_DIR, backend="auto", block_size=8192):
+        self.dim = dim
+        self.path = Path(path)
+        self.block_size = block_size
+        self.backend = "hnsw" if backend in ("auto", "hnsw") and hnswlib is not None else "numpy"
+        self.links = []
+        self.hashes = {}
+        self._rows = {}
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._hnsw = None
+        self._lock = threading.RLock()
+        self._load()
+
+    def __len__(self):
+        return len(self.links)
+
+    @property
+    def vectors(self):
+        return self._vectors[:len(self.links)]
+
+    def _load(self):
+        meta_path = self.path / "meta.json"
+        vectors_path = self.path / "vectors.npy"
+        if not (meta_path.exists() and vectors_path.exists()):
+            return
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("dim") != self.dim:
+            print(f"Vector index at {self.path} has dim {meta.get('dim')}, expected {self.dim}; rebuilding.")
+            return
+        self.links = meta["links"]
+        self.hashes = meta["hashes"]
+        self._rows = {link: row for row, link in enumerate(self.links)}
+        self._vectors = np.load(vectors_path)
+
+        if self.backend == "hnsw":
+            hnsw_path = self.path / "hnsw.bin"
+            self._hnsw = hnswlib.Index(space="ip", dim=self.dim)
+            if hnsw_path.exists():
+                self._hnsw.load_index(str(hnsw_path), max_elements=max(len(self.links), 1024))
+            else:
+                self._hnsw.init_index(max_elements=max(len(self.links), 1024), ef_construction=200, M=16)
+                if self.links:
+                    self._hnsw.add_items(self.vectors, np.arange(len(self.links)))
+
+    def add(self, links, vectors, hashes=None):
+        """Add or replace jobs; links that are already indexed keep their row."""
+        if not len(links):
+            return
+        vectors = _normalize(vectors)
+        hashes = hashes or [None] * len(links)
+        with self._lock:
+            rows = []
+            for link, content_hash in zip(links, hashes):
+                link = canonical_link(link)
+                row = self._rows.get(link)
+                if row is None:
+                    row = len(self.links)
+                    self.links.append(link)
+                    self._rows[link] = row
+                self.hashes[link] = content_hash
+                rows.append(row)
+
+            if len(self.links) > len(self._vectors):
+                grown = np.empty((max(len(self.links), len(self._vectors) * 2, 1024), self.dim), dtype=np.float32)
+                grown[:len(self._vectors)] = self._vectors
+                self._vectors = grown
+            self._vectors[rows] = vectors
+
+            if self.backend == "hnsw":
+                if self._hnsw is None:
+                    self._hnsw = hnswlib.Index(space="ip", dim=self.dim)
+                    self._hnsw.init_index(max_elements=max(len(self.links), 1024), ef_construction=200, M=16)
+                elif len(self.links) > self._hnsw.get_max_elements():
+                    self._hnsw.resize_index(max(len(self.links), self._hnsw.get_max_elements() * 2))
+                # Re-adding an existing label replaces its vector
+                self._hnsw.add_items(vectors, np.asarray(rows))
+
+    def get_vectors(self, links):
+        with self._lock:
+            return self._vectors[[self._rows[canonical_link(link)] for link in links]]
+
+    def search(self, query, k=50, allowed=None):
+        """Return [(link, score)] for the k most similar jobs.
+
+        ``allowed`` is an optional predicate over job links applied as a
+        pre-filter; the HNSW graph checks it while searching, unless so few
+        rows pass that an exact scan is cheaper.
+        """
+        query = _normalize(query)[0]
+        with self._lock:
+            n = len(self.links)
+            if n == 0 or k <= 0:
+                return []
+            if allowed is not None:
+                # Built under the lock, so rows added by other sessions can't outgrow it
+                allowed = np.fromiter((allowed(link) for link in self.links), dtype=bool, count=n)
+            if self.backend != "hnsw":
+                return self._search_blocked(query, min(k, n), allowed)
+            if allowed is None:
+                k = min(k, n)
+                self._hnsw.set_ef(max(k * 2, 64))
+                labels, distances = self._hnsw.knn_query(query, k=k)
+            else:
+                matching = int(allowed.sum())
+                if matching * 10 < n:
+                    # The graph walk finds too few allowed rows; a scan is exact and cheap at this selectivity
+                    return self._search_blocked(query, min(k, n), allowed)
+                k = min(k, matching)
+                # Only allowed rows count towards k, so widen the search in proportion to what is filtered out
+                self._hnsw.set_ef(min(n, max(k * 2, 64) * n // matching))
+                labels, distances = self._hnsw.knn_query(query, k=k, filter=lambda row: bool(allowed[row]))
+            return [(self.links[row], float(1 - dist)) for row, dist in zip(labels[0], distances[0])]
+
+    def _search_blocked(self, query, k, allowed):
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        vectors = self.vectors
+        for start in range(0, len(vectors), self.block_size):
+            block_scores = vectors[start:start + self.block_size] @ query
+            if allowed is not None:
+                block_scores = np.where(allowed[start:start + self.block_size], block_scores, -np.inf)
+            rows = np.concatenate([best_rows, np.arange(start, start + len(block_scores))])
+            scores = np.concatenate([best_scores, block_scores])
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[top], scores[top]
+            best_rows, best_scores = rows, scores
+
+        order = np.argsort(-best_scores, kind="stable")
+        return [(self.links[row], float(score)) for row, score in zip(best_rows[order], best_scores[order]) if np.isfinite(score)]
+
+    def save(self):
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            np.save(self.path / "vectors.tmp.npy", self.vectors)
+            os.replace(self.path / "vectors.tmp.npy", self.path / "vectors.npy")
+            if self._hnsw is not None:
+                self._hnsw.save_index(str(self.path / "hnsw.bin"))
+            meta = {"dim": self.dim, "links": self.links, "hashes": self.hashes}
+            (self.path / "meta.tmp").write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(self.path / "meta.tmp", self.path / "meta.json")
+
+
+def sync_index(index, store, encode):
+    """Embed and index stored jobs that are new or whose content hash changed.
+
+    ``encode`` maps a list of descriptions to a matrix of embeddings. Returns
+    the number of jobs (re)indexed.
+    """
+    stale = [link for link, content_hash in store.content_hashes().items() if index.hashes.get(link) != content_hash]
+    if not stale:
+        return 0
+    jobs = [job for job in store.get_jobs(stale) if job.get("description")]
+    if jobs:
+        index.add([job["link"] for job in jobs], encode([job["description"] for job in jobs]), [job["content_hash"] for job in jobs])
+        index.save()
+    return len(jobs)
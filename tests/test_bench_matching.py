@@ -0,0 +1,15 @@
+from bench_matching import find_regressions, run
+
+
+def test_corpus_stages_run_without_models():
+    report = run(sizes=(100,), repeat=1, with_models=False)
+    stages = report["sizes"]["100"]
+    assert set(stages) == {"flatten_keywords", "cosine_ranking", "build_job_frame", "sidebar_filter", "build_cover_letter"}
+    assert all(timing["best_ms"] >= 0 for timing in stages.values())
+
+
+def test_regressions_respect_threshold_and_noise_floor():
+    baseline = {"sizes": {"1000": {"rank": {"best_ms": 10.0}, "tiny": {"best_ms": 0.1}}}}
+    report = {"sizes": {"1000": {"rank": {"best_ms": 20.0}, "tiny": {"best_ms": 0.5}}}}
+    assert find_regressions(report, baseline) == ["1000 jobs / rank: 10.00 ms -> 20.00 ms (+100%)"]
+    assert find_regressions(baseline, baseline) == []
@@ -0,0 +1,30 @@
+import json
+
+from crawl_metrics import CrawlMetrics, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 21))
+    assert percentile(values, 0.5) == 10
+    assert percentile(values, 0.95) == 19
+    assert percentile([3.0], 0.95) == 3.0
+
+
+def test_summary_and_prometheus_output(tmp_path):
+    metrics = CrawlMetrics()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        metrics.observe("detail.navigate", seconds)
+    with metrics.span("listing.wait"):
+        pass
+    metrics.count("detail.success", 3)
+    metrics.count("detail.timeout")
+
+    summary = metrics.write(tmp_path)
+    assert summary["stages"]["detail.navigate"]["count"] == 4
+    assert summary["stages"]["detail.navigate"]["p50_s"] == 0.2
+    assert summary["counters"] == {"detail.success": 3, "detail.timeout": 1}
+    assert json.loads((tmp_path / "crawl_metrics.json").read_text())["counters"]["detail.success"] == 3
+
+    prom = (tmp_path / "crawl_metrics.prom").read_text()
+    assert 'seek_ingest_stage_seconds{stage="detail.navigate",quantile="0.95"} 0.4' in prom
+    assert 'seek_ingest_events_total{event="detail.timeout"} 1' in prom
@@ -0,0 +1,50 @@
+import numpy as np
+
+from embedding_cache import EmbeddingCache, encode_with_cache
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0, 0.0] for text in texts], dtype=np.float32)
+
+
+def test_only_misses_are_encoded_and_cache_persists(tmp_path):
+    model = FakeModel()
+    cache = EmbeddingCache("fake-model", 3, cache_dir=tmp_path)
+
+    vectors = encode_with_cache(model, ["python  sql", "python sql", "java"], cache)
+    assert model.calls == [["python  sql", "java"]]
+    assert vectors[:, 0].tolist() == [11.0, 11.0, 4.0]
+
+    reopened = EmbeddingCache("fake-model", 3, cache_dir=tmp_path)
+    encode_with_cache(model, ["java", "rust"], reopened)
+    assert model.calls[-1] == ["rust"]
+    assert reopened.stats()["hits"] == 1
+    assert reopened.stats()["misses"] == 1
+
+
+def test_eviction_keeps_cache_bounded(tmp_path):
+    cache = EmbeddingCache("fake-model", 3, cache_dir=tmp_path, max_entries=4)
+    encode_with_cache(FakeModel(), [f"job {i}" for i in range(10)], cache)
+    assert cache.stats()["entries"] <= 4
+
+
+def test_writers_sharing_a_directory_get_distinct_rows(tmp_path):
+    # Two handles opened before either writes stand in for the app and a CLI script
+    first = EmbeddingCache("fake-model", 3, cache_dir=tmp_path)
+    second = EmbeddingCache("fake-model", 3, cache_dir=tmp_path)
+    index_before = first.index_path.read_text(encoding="utf-8")
+
+    first.put_many([first.key("python")], np.array([[1.0, 0.0, 0.0]]))
+    second.put_many([second.key("java")], np.array([[0.0, 1.0, 0.0]]))
+    first.put_many([first.key("rust")], np.array([[0.0, 0.0, 1.0]]))
+
+    # Writes only append to the journal
+    assert first.index_path.read_text(encoding="utf-8") == index_before
+    reopened = EmbeddingCache("fake-model", 3, cache_dir=tmp_path)
+    found = reopened.get_many([reopened.key(text) for text in ("python", "java", "rust")])
+    assert np.array(list(found.values())).tolist() == np.eye(3).tolist()
@@ -0,0 +1,74 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from encoders import ChunkedEncoder, cosine_scores
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+
+class WordTokenizer:
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+class CountingModel:
+    """Embeds a text as (word count, 1) so pooling is easy to check."""
+
+    tokenizer = WordTokenizer()
+
+    def get_max_seq_length(self):
+        return 10
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        return np.array([[len(text.split()), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_importing_encoders_does_not_load_torch_stack():
+    # A fresh interpreter, so modules imported by other tests can't hide an eager import
+    check = "import encoders, sys; assert not {'torch', 'sentence_transformers', 'keybert'} & set(sys.modules)"
+    subprocess.run([sys.executable, "-c", check], cwd=SCRIPTS_DIR, check=True)
+
+
+def test_long_texts_are_chunked_and_pooled():
+    encoder = ChunkedEncoder(CountingModel(), chunk_tokens=4, token_budget=16)
+    chunks, owners, _, batches = encoder.plan(["a b", "a b c d e f g h i j"])
+    assert owners == [0, 1, 1, 1]
+    assert sorted(i for batch in batches for i in batch) == list(range(len(chunks)))
+
+    vectors = encoder.encode(["a b", "a b c d e f g h i j"])
+    assert vectors.shape == (2, 2)
+    assert vectors[0, 0] == 2
+    # Token-weighted mean of chunks of 4, 4 and 2 words
+    assert np.isclose(vectors[1, 0], (4 * 6 + 4 * 6 + 2 * 4) / 16)
+
+
+def test_max_pooling_takes_the_elementwise_max_over_chunks():
+    encoder = ChunkedEncoder(CountingModel(), chunk_tokens=4, pooling="max")
+    vectors = encoder.encode(["a b c d e f g h i j", "a b c"])
+    assert vectors.tolist() == [[4.0, 1.0], [3.0, 1.0]]
+
+
+def test_text_shorter_than_one_chunk_is_encoded_as_is():
+    model = CountingModel()
+    encoder = ChunkedEncoder(model, chunk_tokens=4)
+    chunks, owners, _, _ = encoder.plan(["a  b c"])
+    # Passed through untouched rather than re-decoded from tokens
+    assert chunks == ["a  b c"]
+    assert owners == [0]
+    vector = encoder.encode("a  b c")
+    assert vector.shape == (2,)
+    assert vector.tolist() == model.encode(["a  b c"])[0].tolist()
+
+
+def test_cosine_scores_matches_normalised_dot_product():
+    vectors = np.array([[3.0, 0.0], [1.0, 1.0], [0.0, -2.0]])
+    assert np.allclose(cosine_scores([2.0, 0.0], vectors), [1.0, np.sqrt(0.5), 0.0])
@@ -0,0 +1,75 @@
+import sys
+import threading
+import time
+
+from ingest_queue import IngestQueue
+
+
+def query(keywords):
+    return {"keywords": keywords, "location": "Melbourne VIC", "region": "Australia", "max_jobs": 10}
+
+
+def wait_for(ticket, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not ticket.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return ticket
+
+
+def test_queue_coalesces_identical_searches_and_batches_the_rest(tmp_path):
+    release = threading.Event()
+    crawls = []
+
+    def crawl(queries, threads, **options):
+        crawls.append(([q["keywords"] for q in queries], threads))
+        if len(crawls) == 1:
+            release.wait(5)
+        names = [q["name"] for q in queries]
+        yield names, {"title": "Shared", "link": "https://www.seek.com.au/job/1"}
+        yield names[-1:], {"title": "Only last", "link": "https://www.seek.com.au/job/2"}
+
+    ingest = IngestQueue(max_browsers=3, crawl=crawl, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path)
+    first = ingest.submit(query("data engineer"))
+    while first.status == "queued":
+        time.sleep(0.01)
+    # Queued behind the running crawl: two different searches and a repeat of one of them
+    second = ingest.submit(query("analyst"), threads=8)
+    third = ingest.submit(query("scientist"))
+    repeat = ingest.submit(query("analyst"))
+    assert repeat is second and second.subscribers == 2
+    release.set()
+
+    for ticket in (first, second, third):
+        assert wait_for(ticket).status == "done"
+    assert crawls == [(["data engineer"], 1), (["analyst", "scientist"], 3)]
+    assert [job["title"] for job in second.poll()] == ["Shared"]
+    assert [job["title"] for job in third.poll()] == ["Shared", "Only last"]
+    # Each session gets its own copies to annotate
+    assert second.poll()[0] is not third.poll()[0]
+
+
+def test_failed_crawl_is_reported_on_the_ticket(tmp_path):
+    def crawl(queries, **options):
+        raise RuntimeError("Chrome failed to start")
+        yield
+
+    ingest = IngestQueue(crawl=crawl, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path)
+    ticket = wait_for(ingest.submit(query("data engineer")))
+    assert ticket.status == "failed"
+    assert ticket.error == "Chrome failed to start"
+
+
+def test_worker_survives_a_crawl_that_cannot_start(monkeypatch, tmp_path):
+    # As on a deploy missing a Selenium dependency
+    monkeypatch.setitem(sys.modules, "ingest_seek_selenium", None)
+    ingest = IngestQueue(db_path=tmp_path / "jobs.db", metrics_dir=tmp_path)
+    ticket = wait_for(ingest.submit(query("data engineer")))
+    assert ticket.status == "failed"
+    assert "ingest_seek_selenium" in ticket.error
+
+    # The worker is still there for the next search, which no longer joins the failed one
+    ingest.crawl = lambda queries, **options: iter([([queries[0]["name"]], {"title": "Found"})])
+    retry = wait_for(ingest.submit(query("data engineer")))
+    assert retry is not ticket
+    assert retry.status == "done"
+    assert [job["title"] for job in retry.poll()] == ["Found"]
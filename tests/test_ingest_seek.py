@@ -0,0 +1,108 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from ingest_seek import DetailFetcher, _fetch_detail, extract_page_state, jobs_from_search_state, parse_job_detail
+from rate_limit import RateLimiter
+
+
+def test_parse_job_detail_reads_server_rendered_fields():
+    html = """
+    <div data-automation="jobAdDetails"><p>Build models</p><p>Python, SQL</p></div>
+    <span data-automation="advertiser-name">Acme</span>
+    <span data-automation="job-detail-location">Melbourne VIC</span>
+    <span data-automation="jobListingDate">Posted 2d ago</span>
+    <span data-automation="job-detail-salary">$120,000 – $140,000 per year</span>
+    """
+    detail = parse_job_detail(html)
+    assert detail == {
+        "description": "Build models\nPython, SQL",
+        "company": "Acme",
+        "location": "Melbourne VIC",
+        "date_posted": "Posted 2d ago",
+        "salary": "$120,000 – $140,000 per year",
+    }
+
+
+def test_parse_job_detail_needs_browser_without_ad_body():
+    assert parse_job_detail("<html><div id='app'></div></html>") is None
+
+
+def test_throttled_detail_fetch_is_retried_and_slows_the_limiter():
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, text="<div data-automation='jobAdDetails'>Build models</div>"),
+    ])
+    transport = httpx.MockTransport(lambda request: next(responses))
+    limiter = RateLimiter(rate=4)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=transport) as client:
+            host_limits = {"www.seek.com.au": asyncio.Semaphore(1)}
+            return await _fetch_detail(client, host_limits, {"title": "Job", "link": "https://www.seek.com.au/job/1"}, limiter)
+
+    job, detail = asyncio.run(fetch())
+    assert detail["description"] == "Build models"
+    assert limiter.rate < 4
+
+
+SEARCH_PAGE = """
+<script>
+window.SEEK_REDUX_DATA = {"results": {"results": {"jobs": [
+    {"id": "101", "title": "Data Engineer", "advertiser": {"description": "Acme"},
+     "locations": [{"label": "Melbourne VIC"}], "listingDateDisplay": "2d ago",
+     "salaryLabel": "$120k - $140k", "teaser": "Pipelines </script-free> in Python", "bonus": undefined},
+    {"id": "102", "title": "Analyst", "companyName": "Globex", "location": "Sydney NSW"}
+]}}};
+window.SEEK_APP_CONFIG = {};
+</script>
+"""
+
+
+def test_search_state_yields_listing_fields_in_page_order():
+    jobs = jobs_from_search_state(extract_page_state(SEARCH_PAGE), "https://www.seek.com.au")
+    assert jobs == [
+        {"title": "Data Engineer", "link": "https://www.seek.com.au/job/101", "company": "Acme",
+         "location": "Melbourne VIC", "date_posted": "2d ago", "salary": "$120k - $140k",
+         "teaser": "Pipelines </script-free> in Python"},
+        {"title": "Analyst", "link": "https://www.seek.com.au/job/102", "company": "Globex", "location": "Sydney NSW"},
+    ]
+
+
+def test_parse_job_detail_prefers_state_and_fills_gaps_from_dom():
+    html = """
+    <script>window.SEEK_REDUX_DATA = {"jobdetails": {"result": {"job": {
+        "content": "<p>Build models</p><ul><li>Python</li></ul>",
+        "advertiser": {"name": "Acme"}, "location": {"label": "Melbourne VIC"},
+        "listedAt": {"label": "3d ago"}, "salary": null}}}};</script>
+    <span data-automation="job-detail-salary">$150k</span>
+    """
+    assert parse_job_detail(html) == {
+        "description": "Build models\nPython",
+        "company": "Acme",
+        "location": "Melbourne VIC",
+        "date_posted": "3d ago",
+        "salary": "$150k",
+    }
+
+
+def test_detail_fetcher_caps_requests_per_host_across_threads():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return httpx.Response(200, text="<div data-automation='jobAdDetails'>Build models</div>")
+
+    jobs = [{"title": f"Job {i}", "link": f"https://www.seek.com.au/job/{i}"} for i in range(12)]
+    with DetailFetcher(per_host=2, transport=httpx.MockTransport(handler)) as fetcher:
+        with ThreadPoolExecutor(3) as executor:
+            batches = list(executor.map(fetcher.fetch, [jobs[0:4], jobs[4:8], jobs[8:12]]))
+
+    assert all(detail["description"] == "Build models" for batch in batches for _, detail in batch)
+    assert peak == 2
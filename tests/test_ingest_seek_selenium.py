@@ -0,0 +1,278 @@
+import time
+from contextlib import contextmanager
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import ingest_seek_selenium
+from crawl_checkpoint import CrawlCheckpoint
+from job_store import canonical_link
+
+
+class FakePool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @contextmanager
+    def lease(self):
+        yield None
+
+    def close(self):
+        pass
+
+
+def fake_listing(pages, delays=None):
+    def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+        time.sleep((delays or {}).get(page, 0))
+        return pages.get(page, pages[max(pages)])
+    return fetch_listing_page
+
+
+def cards(*ids):
+    return [{"title": f"Job {i}", "link": f"https://www.seek.com.au/job/{i}?type=promoted"} for i in ids]
+
+
+def test_listing_pages_come_back_in_order_deduplicated(monkeypatch):
+    # Page 1 finishes last; Seek repeats its last page past the end of the results
+    pages = {1: cards(1, 2, 3), 2: cards(3, 4, 5), 3: cards(6)}
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fake_listing(pages, {1: 0.05}))
+    monkeypatch.setattr(ingest_seek_selenium, "SEEK_PAGE_SIZE", 3)
+
+    batches = list(ingest_seek_selenium.iter_listing_pages(FakePool(), max_jobs=100, page_workers=3))
+    assert [[job["title"] for job in batch] for batch in batches] == [["Job 1", "Job 2", "Job 3"], ["Job 4", "Job 5"], ["Job 6"]]
+
+
+def test_listing_stops_at_max_jobs(monkeypatch):
+    pages = {1: cards(1, 2, 3), 2: cards(4, 5, 6), 3: cards(7, 8, 9)}
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fake_listing(pages))
+
+    batches = list(ingest_seek_selenium.iter_listing_pages(FakePool(), max_jobs=4, page_workers=2))
+    assert sum(len(batch) for batch in batches) == 4
+
+
+def test_enrichment_overlaps_listing_and_reads_back_from_store(monkeypatch, tmp_path):
+    pages = {1: cards(1, 2), 2: cards(3, 4), 3: []}
+    # The second listing page is slow; jobs from the first should be enriched meanwhile
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fake_listing(pages, {2: 0.3}))
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    monkeypatch.setattr(ingest_seek_selenium, "SEEK_PAGE_SIZE", 2)
+    enriched_at = {}
+
+    def enrich(job, pool, metrics=None, limiter=None, failures=None):
+        if job["title"] == "Job 2":
+            return {}
+        enriched_at[job["title"]] = time.perf_counter()
+        return {**job, "description": f"About {job['title']}"}
+
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", enrich)
+    progress = []
+    started = time.perf_counter()
+    jobs = list(ingest_seek_selenium.iter_enriched_jobs(
+        max_jobs=10, threads=2, page_workers=1, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path,
+        progress=lambda done, total: progress.append((done, total)),
+    ))
+
+    assert sorted(job["title"] for job in jobs) == ["Job 1", "Job 3", "Job 4"]
+    assert all(job["link"] == f"https://www.seek.com.au/job/{job['title'][-1]}" for job in jobs)
+    assert enriched_at["Job 1"] - started < 0.3
+    assert progress[-1] == (4, 4)
+
+
+def test_two_stage_mode_only_enriches_best_snippets(monkeypatch, tmp_path):
+    pages = {1: [{**job, "teaser": f"teaser {i}"} for i, job in enumerate(cards(1, 2, 3, 4), 1)], 2: []}
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fake_listing(pages))
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    opened = []
+
+    def enrich(job, pool, metrics=None, limiter=None, failures=None):
+        opened.append(job["title"])
+        return {**job, "description": "Full ad"}
+
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", enrich)
+    # Scores the snippet by the job number in its teaser
+    screen = lambda texts: [int(text.rsplit(" ", 1)[1]) for text in texts]
+    progress = []
+    jobs = list(ingest_seek_selenium.iter_enriched_jobs(
+        max_jobs=10, threads=2, page_workers=1, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path,
+        screen=screen, enrich_top_k=2, progress=lambda done, total: progress.append((done, total)),
+    ))
+
+    assert sorted(opened) == ["Job 3", "Job 4"]
+    assert sorted(job["title"] for job in jobs) == ["Job 3", "Job 4"]
+    assert progress[-1] == (4, 4)
+
+
+def test_two_stage_batch_screens_each_query_separately(monkeypatch, tmp_path):
+    listings = {"data-engineer": {1: cards(1, 2), 2: []}, "analytics-engineer": {1: cards(3, 4), 2: []}}
+
+    def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+        return next(pages for slug, pages in listings.items() if slug in url)[page]
+
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fetch_listing_page)
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", lambda job, pool, *args, **kwargs: {**job, "description": "Full ad"})
+    # Every data engineer ad outscores every analytics engineer ad
+    scores = {"Job 1": 5, "Job 2": 6, "Job 3": 1, "Job 4": 0}
+    screen = lambda texts: [scores[text] for text in texts]
+    queries = [
+        {"name": "de", "keywords": "data engineer", "location": "Melbourne VIC", "max_jobs": 10},
+        {"name": "ae", "keywords": "analytics engineer", "location": "Sydney NSW", "max_jobs": 10},
+    ]
+    results = ingest_seek_selenium.crawl_batch(
+        queries, threads=2, page_workers=1, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path, screen=screen, enrich_top_k=1,
+    )
+
+    assert [job["title"] for job in results["de"]] == ["Job 2"]
+    assert [job["title"] for job in results["ae"]] == ["Job 3"]
+
+
+def test_batch_crawl_enriches_shared_ads_once_and_keeps_per_query_results(monkeypatch, tmp_path):
+    listings = {"data-engineer": {1: cards(1, 2, 3), 2: []}, "analytics-engineer": {1: cards(3, 4), 2: []}}
+
+    def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+        return next(pages for slug, pages in listings.items() if slug in url)[page]
+
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fetch_listing_page)
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    opened = []
+
+    def enrich(job, pool, metrics=None, limiter=None, failures=None):
+        opened.append(job["title"])
+        return {**job, "description": "Full ad"}
+
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", enrich)
+    queries = [
+        {"name": "de", "keywords": "data engineer", "location": "Melbourne VIC", "max_jobs": 10},
+        {"name": "ae", "keywords": "analytics engineer", "location": "Sydney NSW", "max_jobs": 10},
+    ]
+    results = ingest_seek_selenium.crawl_batch(queries, threads=2, page_workers=1, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path)
+
+    assert sorted(opened) == ["Job 1", "Job 2", "Job 3", "Job 4"]
+    assert sorted(job["title"] for job in results["de"]) == ["Job 1", "Job 2", "Job 3"]
+    assert sorted(job["title"] for job in results["ae"]) == ["Job 3", "Job 4"]
+
+
+def test_query_listing_only_ads_another_query_finished_still_gets_them(monkeypatch, tmp_path):
+    listings = {"data-engineer": {1: cards(1), 2: []}, "analytics-engineer": {1: cards(1), 2: []}}
+
+    def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+        if "analytics-engineer" in url:
+            # Listed after the data engineer search has finished the ad
+            time.sleep(0.3)
+        return next(pages for slug, pages in listings.items() if slug in url)[page]
+
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fetch_listing_page)
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", lambda job, pool, *args, **kwargs: {**job, "description": "Full ad"})
+    queries = [
+        {"name": "de", "keywords": "data engineer", "location": "Melbourne VIC", "max_jobs": 10},
+        {"name": "ae", "keywords": "analytics engineer", "location": "Sydney NSW", "max_jobs": 10},
+    ]
+    results = ingest_seek_selenium.crawl_batch(queries, threads=1, page_workers=1, db_path=tmp_path / "jobs.db", metrics_dir=tmp_path)
+
+    assert [job["title"] for job in results["ae"]] == ["Job 1"]
+
+
+def test_resumed_run_only_retries_failures(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fake_listing({1: cards(1, 2, 3), 2: []}))
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    opened = []
+
+    def enrich(job, pool, metrics=None, limiter=None, failures=None):
+        opened.append(job["title"])
+        if opened.count("Job 2") == 1 and job["title"] == "Job 2":
+            failures[canonical_link(job["link"])] = "TimeoutException: ad never loaded"
+            return {}
+        return {**job, "description": "Full ad"}
+
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", enrich)
+    options = {"max_jobs": 10, "threads": 1, "page_workers": 1, "db_path": tmp_path / "jobs.db", "metrics_dir": tmp_path}
+    checkpoint = CrawlCheckpoint(path=tmp_path / "jobs.db")
+    first = list(ingest_seek_selenium.iter_enriched_jobs(**options, checkpoint=checkpoint))
+    assert sorted(job["title"] for job in first) == ["Job 1", "Job 3"]
+    assert checkpoint.failures() == [("https://www.seek.com.au/job/2", "TimeoutException: ad never loaded", 1)]
+    checkpoint.close()
+
+    def no_listing(*args, **kwargs):
+        raise AssertionError("the search was already listed")
+
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", no_listing)
+    resumed = CrawlCheckpoint(checkpoint.run_id, tmp_path / "jobs.db")
+    second = list(ingest_seek_selenium.iter_enriched_jobs(**options, checkpoint=resumed))
+    assert [job["title"] for job in second] == ["Job 2"]
+    assert sorted(opened) == ["Job 1", "Job 2", "Job 2", "Job 3"]
+    assert resumed.counts() == {"done": 3}
+    resumed.close()
+
+
+def test_listing_with_no_jobs_wanted_fetches_nothing(monkeypatch):
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fake_listing({1: cards(1, 2)}))
+
+    assert list(ingest_seek_selenium.iter_listing_pages(FakePool(), max_jobs=0)) == []
+
+
+def test_browser_crash_in_http_fallback_only_fails_that_job(monkeypatch):
+    class FakeFetcher:
+        def fetch(self, jobs):
+            return [(job, {"description": "Over HTTP"} if job["title"] == "Job 1" else None) for job in jobs]
+
+    def enrich_single_job(job, driver, metrics=None, limiter=None, failures=None):
+        if job["title"] == "Job 2":
+            raise WebDriverException("chrome not reachable")
+        return {**job, "description": "In a browser"}
+
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_single_job", enrich_single_job)
+    failures = {}
+    results = list(ingest_seek_selenium.iter_enrich_http(cards(1, 2, 3), FakePool(), FakeFetcher(), failures=failures))
+
+    assert [result.get("description") for result in results] == ["Over HTTP", None, "In a browser"]
+    assert failures == {"https://www.seek.com.au/job/2": "driver crashed: Message: chrome not reachable"}
+
+
+def test_listing_page_is_retried_after_a_browser_crash(monkeypatch):
+    crashes = {2: 1, 3: 2}  # page 2 crashes once, page 3 on every attempt
+
+    def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+        if crashes.get(page):
+            crashes[page] -= 1
+            raise WebDriverException("chrome not reachable")
+        return cards(page)
+
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fetch_listing_page)
+    batches = []
+    # Page 3 ends the listing as incomplete after pages 1 and 2 have been handed on
+    with pytest.raises(ingest_seek_selenium.ListingIncomplete) as failed:
+        for batch in ingest_seek_selenium.iter_listing_pages(FakePool(), max_jobs=10, page_workers=1):
+            batches.append(batch)
+    assert failed.value.page == 3
+    assert [[job["title"] for job in batch] for batch in batches] == [["Job 1"], ["Job 2"]]
+
+
+def test_resume_lists_the_pages_a_failed_listing_missed(monkeypatch, tmp_path):
+    pages = {1: cards(1, 2), 2: None, 3: cards(5, 6), 4: []}
+    fetched = []
+
+    def fetch_listing_page(driver, url, page=1, metrics=None, limiter=None):
+        fetched.append(page)
+        return pages[page]
+
+    monkeypatch.setattr(ingest_seek_selenium, "fetch_listing_page", fetch_listing_page)
+    monkeypatch.setattr(ingest_seek_selenium, "DriverPool", FakePool)
+    monkeypatch.setattr(ingest_seek_selenium, "enrich_with_pool", lambda job, pool, *args, **kwargs: {**job, "description": "Full ad"})
+    options = {"max_jobs": 5, "threads": 1, "page_workers": 1, "db_path": tmp_path / "jobs.db", "metrics_dir": tmp_path}
+    checkpoint = CrawlCheckpoint(path=tmp_path / "jobs.db")
+    first = list(ingest_seek_selenium.iter_enriched_jobs(**options, checkpoint=checkpoint))
+    assert sorted(job["title"] for job in first) == ["Job 1", "Job 2"]
+    assert checkpoint.listed_queries() == set()
+    checkpoint.close()
+
+    # Page 2 loads this time, repeating an ad from page 1
+    pages[2] = cards(2, 3, 4)
+    fetched.clear()
+    resumed = CrawlCheckpoint(checkpoint.run_id, tmp_path / "jobs.db")
+    second = list(ingest_seek_selenium.iter_enriched_jobs(**options, checkpoint=resumed))
+    assert fetched[0] == 2
+    # Two ads were listed before, so three more reach max_jobs
+    assert sorted(job["title"] for job in second) == ["Job 3", "Job 4", "Job 5"]
+    assert len(resumed.listed_queries()) == 1
+    resumed.close()
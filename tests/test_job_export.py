@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from job_export import JsonlWriter, embedding_matrix, export_jobs, iter_jsonl, read_jobs_table, sort_jsonl
+from job_store import JobStore
+from vector_index import JobVectorIndex
+
+
+def test_jsonl_writer_streams_and_reader_skips_a_cut_off_line(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    with JsonlWriter(path) as writer:
+        writer.write({"title": "Data Engineer", "link": "https://www.seek.com.au/job/1"})
+        # Each line is on disk before the writer is closed
+        assert list(iter_jsonl(path)) == [{"title": "Data Engineer", "link": "https://www.seek.com.au/job/1"}]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"title": "Analy')
+
+    with JsonlWriter(path) as writer:
+        pass
+    assert [job["title"] for job in iter_jsonl(path)] == ["Data Engineer"]
+    with JsonlWriter(path, append=False):
+        pass
+    assert list(iter_jsonl(path)) == []
+
+
+def test_sort_jsonl_orders_lines_by_key(tmp_path):
+    source, dest = tmp_path / "scored.jsonl", tmp_path / "ranked.jsonl"
+    with JsonlWriter(source) as writer:
+        for title, score in [("B", 0.5), ("A", 0.9), ("C", 0.5), ("D", 0.1)]:
+            writer.write({"title": title, "match_score": score, "description": "Café ✓"})
+
+    assert sort_jsonl(source, dest, key=lambda job: job["match_score"], reverse=True) == 4
+    assert [job["title"] for job in iter_jsonl(dest)] == ["A", "B", "C", "D"]
+    assert next(iter_jsonl(dest))["description"] == "Café ✓"
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_export_round_trips_jobs_and_embeddings_in_batches(tmp_path, suffix):
+    store = JobStore(tmp_path / "jobs.db")
+    jobs = [{"title": f"Job {i}", "link": f"https://www.seek.com.au/job/{i}", "description": f"About {i}", "salary": 100000 + i}
+            for i in range(5)]
+    store.record_listings(jobs)
+    store.save_enriched(jobs)
+    index = JobVectorIndex(3, path=tmp_path / "index")
+    index.add([job["link"] for job in jobs[:4]], np.eye(4, 3, dtype=np.float32) + 1)
+
+    path = tmp_path / f"jobs{suffix}"
+    assert export_jobs(store.iter_jobs(batch_size=2), path, index=index, batch_size=2) == 5
+    store.close()
+
+    table = read_jobs_table(path, columns=["title", "salary", "embedding"])
+    assert table.column_names == ["title", "salary", "embedding"]
+    assert table.column("title").to_pylist() == [f"Job {i}" for i in range(5)]
+    assert table.column("salary").to_pylist()[0] == "100000"
+    assert table.column("embedding").null_count == 1
+    vectors = embedding_matrix(table)
+    assert vectors.shape == (5, 3)
+    np.testing.assert_allclose(vectors[:4], index.get_vectors([job["link"] for job in jobs[:4]]))
+    assert not vectors[4].any()
@@ -0,0 +1,41 @@
+import math
+
+from job_frame import build_job_frame, filter_mask, parse_salary
+
+
+def test_parse_salary_annualises_and_ignores_super():
+    assert parse_salary("$120,000 - $140,000 + 11.5% super") == (120000, 140000)
+    assert parse_salary("$130k – $150k") == (130000, 150000)
+    assert parse_salary("$50 – $60 per hour") == (50 * 38 * 52, 60 * 38 * 52)
+    assert parse_salary("$45 ph") == (45 * 38 * 52, 45 * 38 * 52)
+    assert parse_salary("$45 p.h. + super") == (45 * 38 * 52, 45 * 38 * 52)
+    assert parse_salary("$2,000 - $2,400 per week") == (2000 * 52, 2400 * 52)
+    assert parse_salary("$9,000 per month") == (9000 * 12, 9000 * 12)
+    assert parse_salary("$50/hr") == (50 * 38 * 52, 50 * 38 * 52)
+    # Super rates, contract lengths and amounts in thousands are never scaled by the pay period
+    assert parse_salary("$95k + 12 month contract") == (95000, 95000)
+    assert parse_salary("$800 per day, 6 month contract") == (800 * 5 * 52, 800 * 5 * 52)
+    assert parse_salary("$50 per hour + 11.5% super") == (50 * 38 * 52, 50 * 38 * 52)
+    assert parse_salary("$120k per month") == (120000, 120000)
+    assert parse_salary("$650 per day") == (650 * 5 * 52, 650 * 5 * 52)
+    assert all(math.isnan(value) for value in parse_salary("Competitive"))
+
+
+def test_filter_mask_combines_columns():
+    frame = build_job_frame([
+        {"title": "Data Scientist", "description": "Python", "location": "Melbourne VIC", "date_posted": "Posted 3d ago", "salary": "$130k - $150k"},
+        {"title": "Baker", "description": "Bread", "location": "Sydney NSW", "date_posted": "Posted 30d+ ago", "salary": "$60k"},
+        {"title": "ML Engineer", "description": "python", "location": "Melbourne", "date_posted": "Posted 5h ago", "salary": ""},
+    ])
+    frame["match_score"] = [0.8, 0.9, 0.6]
+
+    assert filter_mask(frame, min_score=0.5, keyword="PYTHON", location="melbourne").tolist() == [True, False, True]
+    assert filter_mask(frame, salary_range=(140000, 200000), max_age_days=7).tolist() == [True, False, True]
+    assert filter_mask(frame, salary_range=(140000, 200000), include_unknown=False).tolist() == [True, False, False]
+
+
+def test_missing_text_fields_become_empty_strings():
+    frame = build_job_frame([{"title": None, "description": None, "salary": None, "location": None, "date_posted": None}])
+    assert frame.loc[0, "search_text"] == " "
+    assert math.isnan(frame.loc[0, "salary_min"])
+    assert filter_mask(frame, keyword="python").tolist() == [False]
@@ -0,0 +1,25 @@
+from job_store import JobStore, canonical_link
+
+
+def test_canonical_link_drops_tracking():
+    link = "https://www.seek.com.au/job/81234567?type=standard&ref=search#sol=abc"
+    assert canonical_link(link) == "https://www.seek.com.au/job/81234567"
+
+
+def test_only_unseen_or_stale_jobs_need_enrichment(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    known = {"title": "Data Scientist", "link": "https://www.seek.com.au/job/1?ref=a"}
+    new = {"title": "ML Engineer", "link": "https://www.seek.com.au/job/2"}
+
+    store.record_listings([known])
+    store.save_enriched([{**known, "description": "Python", "company": "Acme", "location": "Melbourne", "date_posted": "1d ago"}])
+
+    # Same ad reached through a different tracking link is still fresh.
+    relisted = {**known, "link": "https://www.seek.com.au/job/1?ref=b"}
+    assert store.needs_enrichment([relisted, new]) == [new]
+    assert store.needs_enrichment([relisted], max_age_hours=0) == [relisted]
+
+    jobs = store.get_jobs([new["link"], relisted["link"]])
+    assert [job["company"] for job in jobs] == ["Acme"]
+    assert jobs[0]["content_hash"]
+    store.close()
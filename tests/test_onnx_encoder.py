@@ -0,0 +1,65 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+ort = pytest.importorskip("onnxruntime")
+onnx = pytest.importorskip("onnx")
+from onnx import TensorProto, helper
+
+from onnx_encoder import OnnxSentenceEncoder, onnx_model_dir
+
+
+class FakeTokenizer:
+    """Each word becomes the token id of its length, padded with zeros."""
+
+    def __call__(self, texts, padding=True, truncation=True, max_length=None, return_tensors="np"):
+        ids = [[len(word) for word in text.split()][:max_length] for text in texts]
+        width = max(len(row) for row in ids)
+        return {
+            "input_ids": np.array([row + [0] * (width - len(row)) for row in ids]),
+            "attention_mask": np.array([[1] * len(row) + [0] * (width - len(row)) for row in ids]),
+        }
+
+
+def write_model(model_dir):
+    # last_hidden_state[b, s] = (input_ids[b, s], 1)
+    graph = helper.make_graph(
+        [
+            helper.make_node("Cast", ["input_ids"], ["ids"], to=TensorProto.FLOAT),
+            helper.make_node("Unsqueeze", ["ids", "axes"], ["column"]),
+            helper.make_node("Mul", ["column", "zero"], ["zeros"]),
+            helper.make_node("Add", ["zeros", "one"], ["ones"]),
+            helper.make_node("Concat", ["column", "ones"], ["last_hidden_state"], axis=2),
+        ],
+        "fake-encoder",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"])],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "sequence", 2])],
+        initializer=[
+            helper.make_tensor("axes", TensorProto.INT64, [1], [2]),
+            helper.make_tensor("zero", TensorProto.FLOAT, [], [0.0]),
+            helper.make_tensor("one", TensorProto.FLOAT, [], [1.0]),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    model_dir.mkdir(parents=True)
+    onnx.save(model, str(model_dir / "model-int8.onnx"))
+    (model_dir / "max_seq_length.txt").write_text("8")
+
+
+def test_encoder_mean_pools_over_the_mask_and_normalises(monkeypatch, tmp_path):
+    write_model(onnx_model_dir("fake/model", tmp_path))
+    transformers = types.SimpleNamespace(AutoTokenizer=types.SimpleNamespace(from_pretrained=lambda path: FakeTokenizer()))
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+
+    encoder = OnnxSentenceEncoder("fake/model", onnx_dir=tmp_path)
+    assert encoder.get_sentence_embedding_dimension() == 2
+    assert encoder.get_max_seq_length() == 8
+
+    vectors = encoder.encode(["ab abcd", "abc"], batch_size=2)
+    # Padding in the shorter text must not pull its mean towards zero
+    expected = np.array([[3.0, 1.0], [3.0, 1.0]]) / np.sqrt(10)
+    np.testing.assert_allclose(vectors, expected, rtol=1e-6)
+    assert encoder.encode("abc").shape == (2,)
@@ -0,0 +1,30 @@
+import time
+
+from rate_limit import RateLimiter, backoff_delay
+
+
+def test_bucket_allows_a_burst_then_paces_requests():
+    limiter = RateLimiter(rate=20, burst=2)
+    started = time.perf_counter()
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[3] > 0
+    assert time.perf_counter() - started >= 0.08
+
+
+def test_rate_halves_when_throttled_and_recovers_additively():
+    limiter = RateLimiter(rate=2, min_rate=0.5, max_rate=3, increase=0.5, slow_seconds=5)
+    assert limiter.record(throttled=True)
+    assert limiter.rate == 1
+    assert limiter.record(seconds=9)
+    assert limiter.rate == 0.5
+    assert limiter.record(throttled=True) and limiter.rate == 0.5
+    for _ in range(10):
+        assert not limiter.record(seconds=0.2)
+    assert limiter.rate == 3
+
+
+def test_backoff_grows_and_is_capped():
+    assert all(0 <= backoff_delay(1, base=1) <= 1 for _ in range(50))
+    assert all(0 <= backoff_delay(10, base=1, cap=5) <= 5 for _ in range(50))
+    assert max(backoff_delay(4, base=1) for _ in range(200)) > 1
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+import resume_analysis
+from resume_analysis import analyse_resume, file_hash, read_resume
+
+
+class FakeEncoder:
+    def encode(self, text):
+        return np.full(3, len(text), dtype=np.float32)
+
+
+def test_analysis_bundles_text_keywords_and_embedding(monkeypatch):
+    monkeypatch.setattr(resume_analysis, "extract_resume_keywords", lambda text: ["python sql", "machine learning"])
+    data = "Python and SQL for machine learning".encode("utf-8")
+
+    analysis = analyse_resume("cv.txt", data, FakeEncoder())
+    assert analysis.content_hash == file_hash(data)
+    assert analysis.text == "Python and SQL for machine learning"
+    assert analysis.keyphrases == ("python sql", "machine learning")
+    assert analysis.keywords == ["learning", "machine", "python", "sql"]
+    assert analysis.embedding.tolist() == [35, 35, 35]
+
+
+def test_unsupported_resume_type_is_rejected():
+    with pytest.raises(ValueError):
+        read_resume("cv.pdf", b"%PDF")
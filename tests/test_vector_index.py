@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from vector_index import JobVectorIndex
+
+
+def test_blocked_search_matches_exact_ranking_and_prefilter(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 8)).astype(np.float32)
+    links = [f"https://www.seek.com.au/job/{i}" for i in range(300)]
+    index = JobVectorIndex(8, path=tmp_path, backend="numpy", block_size=64)
+    index.add(links[:200], vectors[:200])
+    index.add(links[200:], vectors[200:])
+
+    query = rng.normal(size=8)
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normed @ (query / np.linalg.norm(query))))[:5]
+    assert [link for link, _ in index.search(query, k=5)] == [links[i] for i in expected]
+
+    even = lambda link: int(link.rsplit("/", 1)[1]) % 2 == 0
+    assert all(even(link) for link, _ in index.search(query, k=10, allowed=even))
+
+
+def test_index_persists_and_replaces_existing_links(tmp_path):
+    index = JobVectorIndex(2, path=tmp_path, backend="numpy")
+    index.add(["https://www.seek.com.au/job/1?ref=x"], [[1.0, 0.0]], ["hash-a"])
+    index.save()
+
+    reopened = JobVectorIndex(2, path=tmp_path, backend="numpy")
+    reopened.add(["https://www.seek.com.au/job/1"], [[0.0, 1.0]], ["hash-b"])
+    assert len(reopened) == 1
+    assert reopened.hashes["https://www.seek.com.au/job/1"] == "hash-b"
+    assert reopened.search([0.0, 1.0], k=1)[0][1] > 0.99
+
+
+def test_hnsw_search_applies_the_prefilter(tmp_path):
+    pytest.importorskip("hnswlib")
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 8)).astype(np.float32)
+    links = [f"https://www.seek.com.au/job/{i}" for i in range(500)]
+    index = JobVectorIndex(8, path=tmp_path, backend="hnsw")
+    index.add(links, vectors)
+    assert index.backend == "hnsw"
+
+    even = lambda link: int(link.rsplit("/", 1)[1]) % 2 == 0
+    hits = index.search(rng.normal(size=8), k=10, allowed=even)
+    assert len(hits) == 10
+    assert all(int(link.rsplit("/", 1)[1]) % 2 == 0 for link, _ in hits)